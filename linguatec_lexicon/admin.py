@@ -1,6 +1,6 @@
 from django.contrib import admin
 from linguatec_lexicon.models import (Entry, Example, VerbalConjugation)
-from . import models
+from . import documents, models
 
 
 def custom_titled_filter(title):
@@ -12,15 +12,81 @@ def custom_titled_filter(title):
     return Wrapper
 
 
+class DataVersionAdminMixin:
+    """
+    Bump the data version of the lexicons affected by the changes.
+
+    `lexicon_lookup` is the lookup from Lexicon to the model managed by
+    the admin; None means that every lexicon is affected.
+
+    `word_lookup` is the lookup from Word to the model managed by the
+    admin and allows refreshing only the documents of the affected words
+    (see documents module); None means that they should be rebuilt.
+    """
+    lexicon_lookup = None
+    word_lookup = None
+
+    def get_affected_lexicons(self, pks):
+        qs = models.Lexicon.objects.all()
+        if self.lexicon_lookup is not None:
+            qs = qs.filter(**{self.lexicon_lookup + '__in': pks})
+        return set(qs.values_list('pk', flat=True))
+
+    def get_affected_words(self, pks):
+        if self.word_lookup is None:
+            return None
+        qs = models.Word.objects.filter(**{self.word_lookup + '__in': pks})
+        return set(qs.values_list('pk', flat=True))
+
+    def get_affected_by_delete(self, pks):
+        lexicons = self.get_affected_lexicons(pks)
+        words = self.get_affected_words(pks)
+        if words is not None and self.model is models.Word:
+            # conjugations using deleted words as model lose their reference
+            # (see VerbalConjugation.model_word_ref)
+            referencing = models.Word.objects.filter(
+                entries__conjugation__model_word_ref__in=pks,
+            ).exclude(pk__in=pks)
+            for lexicon_id, word_id in referencing.values_list('lexicon_id', 'pk'):
+                lexicons.add(lexicon_id)
+                words.add(word_id)
+        return lexicons, words
+
+    def bump_data_version(self, lexicons, words=None):
+        lexicons = models.Lexicon.objects.filter(pk__in=lexicons)
+        versions = dict(lexicons.values_list('pk', 'data_version'))
+        lexicons.bump_data_version()
+        if words is not None:
+            documents.refresh_documents(versions, words)
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        pks = [form.instance.pk]
+        self.bump_data_version(self.get_affected_lexicons(pks), self.get_affected_words(pks))
+
+    def delete_model(self, request, obj):
+        # resolve affected objects before the relations are removed
+        lexicons, words = self.get_affected_by_delete([obj.pk])
+        super().delete_model(request, obj)
+        self.bump_data_version(lexicons, words)
+
+    def delete_queryset(self, request, queryset):
+        pks = list(queryset.values_list('pk', flat=True))
+        lexicons, words = self.get_affected_by_delete(pks)
+        super().delete_queryset(request, queryset)
+        self.bump_data_version(lexicons, words)
+
+
 @admin.register(models.Lexicon)
-class LexiconAdmin(admin.ModelAdmin):
+class LexiconAdmin(DataVersionAdminMixin, admin.ModelAdmin):
+    lexicon_lookup = 'pk'
     list_display = ('name', 'src_language', 'dst_language',)
     search_fields = ('name',)
     list_filter = ('src_language', 'dst_language',)
 
 
 @admin.register(models.GramaticalCategory)
-class GramaticalCategoryAdmin(admin.ModelAdmin):
+class GramaticalCategoryAdmin(DataVersionAdminMixin, admin.ModelAdmin):
     list_display = ('abbreviation', 'title',)
 
 
@@ -31,7 +97,9 @@ class EntryInline(admin.TabularInline):
 
 
 @admin.register(models.Word)
-class WordAdmin(admin.ModelAdmin):
+class WordAdmin(DataVersionAdminMixin, admin.ModelAdmin):
+    lexicon_lookup = 'words'
+    word_lookup = 'pk'
     list_display = ('term', 'lexicon',)
     search_fields = ('term',)
     list_filter = (('lexicon__name', custom_titled_filter('Lexicon name')),
@@ -53,7 +121,9 @@ class VerbalConjugationInline(admin.StackedInline):
 
 
 @admin.register(models.Entry)
-class EntryAdmin(admin.ModelAdmin):
+class EntryAdmin(DataVersionAdminMixin, admin.ModelAdmin):
+    lexicon_lookup = 'words__entries'
+    word_lookup = 'entries'
     list_display = ('word', 'translation', 'variation')
     search_fields = ('word__term',)
     list_filter = ('word__lexicon',
@@ -70,7 +140,9 @@ class EntryAdmin(admin.ModelAdmin):
 
 
 @admin.register(models.Example)
-class ExampleAdmin(admin.ModelAdmin):
+class ExampleAdmin(DataVersionAdminMixin, admin.ModelAdmin):
+    lexicon_lookup = 'words__entries__examples'
+    word_lookup = 'entries__examples'
     list_display = ('phrase', 'entry',)
     search_fields = ('entry__word__term',)
     list_filter = (('entry__word__lexicon', custom_titled_filter('Lexicon name')),
@@ -79,10 +151,10 @@ class ExampleAdmin(admin.ModelAdmin):
 
 
 @admin.register(models.Region)
-class RegionAdmin(admin.ModelAdmin):
+class RegionAdmin(DataVersionAdminMixin, admin.ModelAdmin):
     list_display = ('name',)
 
 
 @admin.register(models.DiatopicVariation)
-class DiatopicVariationAdmin(admin.ModelAdmin):
+class DiatopicVariationAdmin(DataVersionAdminMixin, admin.ModelAdmin):
     list_display = ('name',)
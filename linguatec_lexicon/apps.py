@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class LinguatecLexiconConfig(AppConfig):
     default_auto_field = 'django.db.models.AutoField'
     name = 'linguatec_lexicon'
+
+    def ready(self):
+        from linguatec_lexicon import signals  # noqa: F401
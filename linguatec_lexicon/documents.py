@@ -0,0 +1,142 @@
+"""
+Precomputed word documents: the JSON representation of the words (as
+returned by WordSerializer) is stored on WordDocument so the API can
+serve it without retrieving all the related data of the word.
+
+Documents are tied to the data version of the lexicon: when the data of
+a lexicon changes its documents are ignored until they are rebuilt (see
+builddocuments command). Changes done using the admin refresh only the
+documents of the modified words.
+
+"""
+import json
+
+from django.conf import settings
+
+from .models import (Lexicon, WordDocument, lexicon_registry,
+                     prefetch_words_entries)
+from .serializers import WordSerializer
+
+
+def is_enabled(request):
+    if not getattr(settings, 'LINGUATEC_WORD_DOCUMENTS', False):
+        return False
+
+    # staff users get extra fields (e.g. admin_panel_url)
+    user = request.user
+    return not (user.is_authenticated and user.is_staff)
+
+
+def build_documents(lexicon, words=None, batch_size=100):
+    """
+    (Re)build the documents of the words of the lexicon (all of them
+    unless a list of word ids is provided).
+    """
+    # retrieve version before the words so concurrent changes leave
+    # documents outdated instead of wrongly up to date
+    version = Lexicon.objects.filter(pk=lexicon.pk).values_list('data_version', flat=True).get()
+
+    qs = lexicon.words.prefetch_entries().order_by('pk')
+    if words is not None:
+        qs = qs.filter(pk__in=words)
+
+    documents = []
+    count = 0
+    for word in qs.iterator(chunk_size=batch_size):
+        data = WordSerializer(word, context={'request': None}).data
+        documents.append(WordDocument(word=word, data_version=version, content=json.dumps(data)))
+        if len(documents) >= batch_size:
+            count += save_documents(documents)
+            documents = []
+
+    count += save_documents(documents)
+    return count
+
+
+def save_documents(documents):
+    WordDocument.objects.bulk_create(
+        documents, update_conflicts=True, unique_fields=['word'],
+        update_fields=['data_version', 'content'],
+    )
+    return len(documents)
+
+
+def refresh_documents(versions, words):
+    """
+    Rebuild the documents of the changed words and mark as up to date
+    the documents of the other words of the lexicons.
+
+    `versions` are the data versions of the lexicons before the change.
+    """
+    if not getattr(settings, 'LINGUATEC_WORD_DOCUMENTS', False):
+        return
+
+    for lexicon in Lexicon.objects.filter(pk__in=versions):
+        old_version = versions[lexicon.pk]
+        if lexicon.data_version != old_version + 1:
+            # there are other changes: all the documents should be rebuilt
+            continue
+
+        WordDocument.objects.filter(
+            word__lexicon=lexicon, data_version=old_version,
+        ).exclude(word__in=words).update(data_version=lexicon.data_version)
+        build_documents(lexicon, words=words)
+
+
+def load_document(content, request):
+    data = json.loads(content)
+    # documents store a relative url because it depends on the request
+    data['url'] = request.build_absolute_uri(data['url'])
+    return data
+
+
+def lexicon_versions():
+    return {lexicon.pk: lexicon.data_version for lexicon in lexicon_registry.all()}
+
+
+def get_document(request, **lookup):
+    """
+    Return the data of the word matching the lookup (e.g. word__slug)
+    or None if there isn't an up to date document.
+    """
+    row = WordDocument.objects.filter(**lookup).values_list(
+        'word__lexicon_id', 'data_version', 'content').first()
+    if row is None:
+        return None
+
+    lexicon_id, version, content = row
+    if lexicon_versions().get(lexicon_id) != version:
+        return None
+
+    return load_document(content, request)
+
+
+def serialize_words(words, context):
+    """
+    Serialize the words using their documents. Words without an up to
+    date document are serialized using WordSerializer.
+    """
+    request = context['request']
+    words = list(words)
+    versions = lexicon_versions()
+
+    documents = {}
+    qs = WordDocument.objects.filter(word__in=[word.pk for word in words])
+    for word_id, version, content in qs.values_list('word_id', 'data_version', 'content'):
+        documents[word_id] = (version, content)
+
+    data = {}
+    missing = []
+    for word in words:
+        version, content = documents.get(word.pk, (None, None))
+        if version is not None and version == versions.get(word.lexicon_id):
+            data[word.pk] = load_document(content, request)
+        else:
+            missing.append(word)
+
+    if missing:
+        prefetch_words_entries(missing)
+        for word, item in zip(missing, WordSerializer(missing, many=True, context=context).data):
+            data[word.pk] = item
+
+    return [data[word.pk] for word in words]
@@ -1,7 +1,21 @@
 from django import forms
 from django.core import validators
+from django.template.defaultfilters import filesizeformat
+
+from linguatec_lexicon.uploads import get_upload_max_size
 
 
 class ValidatorForm(forms.Form):
     input_file = forms.FileField(
         validators=[validators.FileExtensionValidator(allowed_extensions=["xlsx"])])
+
+    def clean_input_file(self):
+        input_file = self.cleaned_data['input_file']
+        max_size = get_upload_max_size()
+        if max_size and input_file.size > max_size:
+            raise forms.ValidationError(
+                "File too large (%(size)s). Maximum allowed size is %(max_size)s.",
+                code='max_size',
+                params={'size': filesizeformat(input_file.size), 'max_size': filesizeformat(max_size)},
+            )
+        return input_file
@@ -0,0 +1,127 @@
+"""
+Loaders used by import commands to insert model instances.
+
+`bulk` uses Django bulk_create (any database backend). `copy` streams
+the rows using PostgreSQL `COPY ... FROM STDIN` which is much faster on
+big imports: primary keys are reserved from the table sequence before
+copying so instances get their PK like with bulk_create. Both run inside
+the current transaction.
+
+"""
+from django.db import DEFAULT_DB_ALIAS, connections
+
+LOADERS = ['bulk', 'copy']
+
+
+class BulkCreateLoader:
+    name = 'bulk'
+
+    def __init__(self, batch_size=None, using=DEFAULT_DB_ALIAS):
+        self.batch_size = batch_size
+        self.using = using
+
+    def create(self, model, objs):
+        return model.objects.using(self.using).bulk_create(objs, batch_size=self.batch_size)
+
+
+class CopyLoader(BulkCreateLoader):
+    name = 'copy'
+
+    @classmethod
+    def is_supported(cls, using=DEFAULT_DB_ALIAS):
+        return connections[using].vendor == 'postgresql'
+
+    def create(self, model, objs):
+        objs = list(objs)
+        if not objs:
+            return objs
+
+        connection = connections[self.using]
+        opts = model._meta
+        fields = opts.concrete_fields
+        qn = connection.ops.quote_name
+
+        with connection.cursor() as cursor:
+            self.reserve_pks(cursor, model, objs)
+
+            sql = 'COPY {} ({}) FROM STDIN'.format(
+                qn(opts.db_table), ', '.join(qn(field.column) for field in fields))
+            lines = (self.to_line(connection, fields, obj) for obj in objs)
+            with connection.wrap_database_errors:
+                copy_lines(cursor.cursor, sql, lines)
+
+        for obj in objs:
+            obj._state.adding = False
+            obj._state.db = self.using
+        return objs
+
+    def reserve_pks(self, cursor, model, objs):
+        pending = [obj for obj in objs if obj.pk is None]
+        if not pending:
+            return
+
+        pk = model._meta.pk
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+            [model._meta.db_table, pk.column, len(pending)],
+        )
+        for obj, (value,) in zip(pending, cursor.fetchall()):
+            setattr(obj, pk.attname, value)
+
+    def to_line(self, connection, fields, obj):
+        values = []
+        for field in fields:
+            value = field.get_db_prep_save(field.pre_save(obj, add=True), connection)
+            values.append(to_copy_text(value))
+        return '\t'.join(values) + '\n'
+
+
+def to_copy_text(value):
+    """Format a value using COPY text format."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+class LinesReader:
+    """File-like object which reads lines from an iterator (avoid building the whole content)."""
+
+    def __init__(self, lines):
+        self.lines = iter(lines)
+        self.buffer = ''
+
+    def read(self, size=-1):
+        while size < 0 or len(self.buffer) < size:
+            try:
+                self.buffer += next(self.lines)
+            except StopIteration:
+                break
+
+        if size < 0:
+            size = len(self.buffer)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+
+def copy_lines(cursor, sql, lines):
+    if hasattr(cursor, 'copy_expert'):
+        # psycopg2
+        cursor.copy_expert(sql, LinesReader(lines))
+    else:
+        # psycopg (3)
+        with cursor.copy(sql) as copy:
+            for line in lines:
+                copy.write(line)
+
+
+def get_loader(name, batch_size=None, using=DEFAULT_DB_ALIAS):
+    """
+    Return the loader `name`. COPY requires PostgreSQL so bulk_create is
+    used as fallback on other database backends.
+    """
+    if name == CopyLoader.name and CopyLoader.is_supported(using):
+        return CopyLoader(batch_size, using)
+    return BulkCreateLoader(batch_size, using)
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from linguatec_lexicon import documents
+from linguatec_lexicon.models import Lexicon
+
+
+class Command(BaseCommand):
+    help = 'Build precomputed word documents served by the API (run it after importing data)'
+    default_batch_size = 100
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'lexicon_code', nargs='*',
+            help="Select the lexicons whose documents will be built. By default: all",
+        )
+        parser.add_argument(
+            '--batch-size', type=int,
+            help=("Controls how many documents are stored in a single query. "
+                  "By default: {}").format(self.default_batch_size),
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size'] or self.default_batch_size
+
+        lexicons = Lexicon.objects.all()
+        if options['lexicon_code']:
+            try:
+                lexicons = [Lexicon.objects.get_by_slug(code) for code in options['lexicon_code']]
+            except (ValueError, Lexicon.DoesNotExist) as e:
+                raise CommandError('Error: Invalid lexicon code: {}'.format(e))
+
+        for lexicon in lexicons:
+            built = documents.build_documents(lexicon, batch_size=self.batch_size)
+            self.stdout.write("Lexicon {} built {} documents".format(lexicon.slug, built))
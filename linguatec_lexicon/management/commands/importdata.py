@@ -1,15 +1,23 @@
 import json
+import math
+import os
 import sys
+import time
+from collections import defaultdict
 
 import pandas as pd
 from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand, CommandError
 from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
 from django.utils.functional import cached_property
+from openpyxl import load_workbook
 
-from linguatec_lexicon import utils
+from linguatec_lexicon import loaders, utils
 from linguatec_lexicon.models import (Entry, Example, GramaticalCategory,
-                                      Label, Lexicon, VerbalConjugation, Word)
+                                      Label, Lexicon, TaskProgress,
+                                      VerbalConjugation, Word)
+from linguatec_lexicon.progress import ProgressReporter
 from linguatec_lexicon.validators import validate_column_verb_conjugation
 
 # gramcat auto correction (very common mistakes that could be autocorrected)
@@ -53,6 +61,74 @@ def extract_gramcats(db):
     return gramcats
 
 
+# input file columns: word, gramcats, translations, labels, examples, conjugations
+COLUMNS = 6
+
+
+def normalize_row(values):
+    """
+    Convert cell values into stripped strings (empty cells as '') and
+    pad the row up to COLUMNS values.
+    """
+    row = []
+    for value in values:
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            value = ''
+        elif isinstance(value, str):
+            value = value.strip()
+        else:
+            value = str(value)
+        row.append(value)
+
+    row += [''] * (COLUMNS - len(row))
+    return tuple(row)
+
+
+def entry_values(entry):
+    """Values of a cleaned entry compared to detect changes (see db_entry_values)."""
+    conjugation = getattr(entry, 'clean_conjugation', None)
+    return (
+        sorted({gramcat.pk for gramcat in entry.clean_gramcats}),
+        [entry.label] if getattr(entry, 'label', None) else [],
+        [example.phrase for example in entry.clean_examples],
+        conjugation.raw if conjugation is not None else None,
+    )
+
+
+def db_entry_values(entry):
+    try:
+        conjugation = entry.conjugation.raw
+    except VerbalConjugation.DoesNotExist:
+        conjugation = None
+    return (
+        sorted(gramcat.pk for gramcat in entry.gramcats.all()),
+        sorted(label.name for label in entry.labels.all()),
+        [example.phrase for example in entry.examples.all()],
+        conjugation,
+    )
+
+
+class Changeset:
+    """Differences between the input file and the database (see --update)."""
+
+    def __init__(self):
+        self.new_words = []
+        self.deleted_words = []
+        self.new_entries = []
+        self.changed_entries = []
+        self.deleted_entries = []
+
+    def __bool__(self):
+        return any([self.new_words, self.deleted_words, self.new_entries,
+                    self.changed_entries, self.deleted_entries])
+
+    def __str__(self):
+        return "words: +{} -{} | entries: +{} ~{} -{}".format(
+            len(self.new_words), len(self.deleted_words), len(self.new_entries),
+            len(self.changed_entries), len(self.deleted_entries),
+        )
+
+
 def is_verb(gramcats):
     for gramcat in gramcats:
         if (gramcat.abbreviation.startswith('v.')
@@ -62,6 +138,15 @@ def is_verb(gramcats):
 
 
 class Command(BaseCommand):
+    default_batch_size = 500
+    # attributes which store the result of parse()
+    parsed_attrs = ['errors', 'cleaned_data', 'cleaned_entries', 'cleaned_labels']
+    # progress reporter (see progress module) only available using call_command
+    stealth_options = ('progress',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.progress = ProgressReporter()
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -77,13 +162,70 @@ class Command(BaseCommand):
             '--allow-partial', action='store_true', dest='allow_partial',
             help="Allow verbs with partial or unknown format conjugations. USE WITH CAUTION",
         )
+        parser.add_argument(
+            '--batch-size', type=int,
+            help=("Controls how many objects are created in a single query. "
+                  "Directly passed to bulk_create. By default: {}").format(self.default_batch_size),
+        )
+        parser.add_argument(
+            '--loader', choices=loaders.LOADERS, default='bulk',
+            help=("How rows are inserted: 'bulk' (bulk_create) or 'copy' (PostgreSQL COPY, "
+                  "fallback to bulk on other databases). By default: bulk"),
+        )
+        parser.add_argument(
+            '--update', action='store_true',
+            help=("Update words already imported on the lexicon: apply only the differences "
+                  "between the input file and the database (entries matched by translation)."),
+        )
+        parser.add_argument(
+            '--prune', action='store_true',
+            help="With --update, delete words of the lexicon which are not in the input file.",
+        )
 
     def handle(self, *args, **options):
+        self.prepare(**options)
+
+        self.stdout.write(self.style.NOTICE(f"INFO\tinput file: {self.input_file}\n"))
+
+        self.parse()
+
+        if self.verbosity >= 2 and self.cleaned_labels:
+            self.stdout.write(f"Labels of {self.lexicon.slug}")
+            self.stdout.write("; ".join(self.cleaned_labels))
+
+        if self.errors:
+            self.stdout.write(self.style.ERROR(f"Detected {len(self.errors)} errors!"))
+            if self.verbosity >= 2:
+                for error in self.errors:
+                    self.stdout.write(self.style.ERROR(json.dumps(error)))
+
+        elif self.update:
+            changeset = self.diff_database()
+            self.stdout.write(f"Changes: {changeset}")
+            if not self.dry_run:
+                self.update_database(changeset)
+
+        elif not self.dry_run:
+            # Write data into the database
+            self.write_to_database()
+
+    def prepare(self, **options):
+        """Validate options and initialize the command (see importmanifest)."""
         self.dry_run = options['dry_run']
         self.verbosity = options['verbosity']
         self.input_file = options['input_file']
         self.allow_partial = options['allow_partial']
         self.lexicon_code = options['lexicon_code']
+        self.batch_size = options['batch_size'] or self.default_batch_size
+        self.update = options['update']
+        self.prune = options['prune']
+        self.progress = options.get('progress') or ProgressReporter(self.input_file)
+        if self.prune and not self.update:
+            raise CommandError("--prune can only be used with --update")
+        self.loader = loaders.get_loader(options['loader'], self.batch_size)
+        if self.loader.name != options['loader']:
+            self.stdout.write(self.style.WARNING(
+                f"WARNING\tloader '{options['loader']}' is not supported, using '{self.loader.name}'\n"))
 
         # check that GramaticalCategories are initialized
         if not GramaticalCategory.objects.all().exists():
@@ -99,49 +241,46 @@ class Command(BaseCommand):
         except Lexicon.DoesNotExist:
             raise CommandError('Error: There is not a lexicon with that code: ' + self.lexicon_code)
 
-        self.stdout.write(self.style.NOTICE(f"INFO\tinput file: {self.input_file}\n"))
-
-        db = self.read_input_file()
+    def parse(self):
+        """Read the input file and validate its data."""
+        self.progress.start(TaskProgress.VALIDATING)
+        rows = self.read_input_file()
 
         # TODO add arg to print (or not gramcats)
         # gramcats = extract_gramcats(db)
 
-        self.populate_models(db)
-
-        if self.verbosity >= 2 and self.cleaned_labels:
-            self.stdout.write(f"Labels of {self.lexicon.slug}")
-            self.stdout.write("; ".join(self.cleaned_labels))
-
-        if self.errors:
-            self.stdout.write(self.style.ERROR(f"Detected {len(self.errors)} errors!"))
-            if self.verbosity >= 2:
-                for error in self.errors:
-                    self.stdout.write(self.style.ERROR(json.dumps(error)))
-
-        elif not self.dry_run:
-            # Write data into the database
-            self.write_to_database()
+        self.populate_models(rows)
 
     def read_input_file(self):
-        df = pd.DataFrame()
+        """
+        Yield the rows of all the sheets as tuples (row_number, A, B, C, D,
+        E, F) of normalized values (see normalize_row).
 
-        xlsx = pd.ExcelFile(self.input_file)
+        XLSX files are streamed so memory doesn't depend on the file size.
+        """
+        _, extension = os.path.splitext(self.input_file)
+        if extension.lower() not in ['.xlsx', '.xlsm']:
+            yield from self.read_input_file_pandas()
+            return
 
-        data = []
+        workbook = load_workbook(self.input_file, read_only=True, data_only=True)
+        # dimensions may be missing on read only mode
+        self.progress.total = sum(sheet.max_row or 0 for sheet in workbook.worksheets) or None
+        try:
+            for sheet in workbook.worksheets:
+                rows = sheet.iter_rows(max_col=COLUMNS, values_only=True)
+                for row_number, values in enumerate(rows, start=1):
+                    yield (row_number,) + normalize_row(values)
+        finally:
+            workbook.close()
+
+    def read_input_file_pandas(self):
+        # other formats supported by pandas (e.g. ODS) are read sheet by sheet
+        xlsx = pd.ExcelFile(self.input_file)
         for sheet in xlsx.sheet_names:
-            # we define na_values and keep_default_na because defaults na_values
-            # includes empty string. We don't want that pandas replaces empty
-            # cells with 'nan'
-            partial = xlsx.parse(sheet, header=None, usecols='A:F')
-            # names=['colA', 'colB', 'colC', 'colD', 'colE', 'colF'])
-            data.append(partial)
-
-        df = pd.concat(data)
-        df_obj = df.select_dtypes(['object'])
-        df[df_obj.columns] = df_obj.apply(lambda x: x.str.strip())
-        df = df.fillna('')  # replace NaN with blank string
-
-        return df
+            df = xlsx.parse(sheet, header=None, usecols='A:F')
+            for row in df.itertuples(name=None):
+                yield (row[0] + 1,) + normalize_row(row[1:])
 
     def get_or_create_word(self, term):
         try:
@@ -156,6 +295,7 @@ class Command(BaseCommand):
         created, word = self.get_or_create_word(w_str)
         if created:
             word.slug = utils.calculate_slug(self.lexicon.slug, word.term)
+            word.normalized_term = utils.normalize_term(word.term)
             self.cleaned_data[word.term] = word
 
         return word
@@ -276,17 +416,17 @@ class Command(BaseCommand):
                     word.clean_entries[i].clean_conjugation = VerbalConjugation(
                         raw=raw_conjugation)
 
-    def populate_models(self, db):
+    def populate_models(self, rows):
         self.errors = []
         self.cleaned_data = {}
         self.cleaned_entries = []
         self.cleaned_labels = set()
-        for row in db.itertuples(name=None):
-            # itertuples by default return the index as the first element of the tuple.
+        for count, row in enumerate(rows, start=1):
+            self.progress.update(count, self.errors)
+            # first element of the tuple is the row number (see read_input_file)
 
             # filter empty rows
-            # TODO how to ignore empty rows in an elegant way?
-            if pd.isnull(row) or pd.isna(row[1]) or pd.isnull(row[1]) or row[1] == '':
+            if row[1] == '':
                 continue
 
             # column A is word (required)
@@ -299,25 +439,16 @@ class Command(BaseCommand):
             self.populate_entries(word, gramcats, row[3])
 
             # column D is label or category (optional)
-            try:
-                label_str = row[4]
-            except IndexError:
-                continue
-            self.populate_label(word, label_str)
+            self.populate_label(word, row[4])
 
             # column E is example (optional)
-            try:
-                ex_str = row[5]
-            except IndexError:
-                continue
-            self.populate_examples(word, ex_str)
+            self.populate_examples(word, row[5])
 
-            # column F is verb conjugation
-            try:
-                conjugation_str = row[6]
-            except IndexError:
-                continue
-            self.populate_verbal_conjugation(word, gramcats, conjugation_str)
+            # column F is verb conjugation (optional)
+            self.populate_verbal_conjugation(word, gramcats, row[6])
+
+        # errors of the last row
+        self.progress.update(self.progress.rows, self.errors)
 
     def populate_label(self, word, label_str):
         # support multiple label (separated by "//")
@@ -343,65 +474,202 @@ class Command(BaseCommand):
             for i, entry in enumerate(word.clean_entries):
                 entry.label = row_labels[i]
 
+    def insert(self, model, objs):
+        """
+        Insert objs using the selected loader and keep track of the number
+        of rows inserted and the time spent per table.
+        """
+        start = time.perf_counter()
+        objs = self.loader.create(model, objs)
+        self.insert_stats.append((model._meta.db_table, len(objs), time.perf_counter() - start))
+        self.progress.update(self.progress.rows + len(objs))
+        return objs
+
     @transaction.atomic
     def write_to_database(self):
-        count_words = 0
-        count_entries = 0
-        count_examples = 0
+        self.insert_stats = []
+        self.progress.start(TaskProgress.WRITING)
 
         try:
-            Word.objects.bulk_create(self.cleaned_data.values(), batch_size=100)
+            self.insert(Word, self.cleaned_data.values())
         except IntegrityError as e:
             self.stdout.write(self.style.ERROR(
                 "Error: Already exists term '{}' on lexicon '{}'".format(e, self.lexicon_code)
             ))
+            self.stdout.write("Use --update to update the words already imported.")
             sys.exit(1)
 
         # retrieve words to get its PK
         words = {w[0]: w[1] for w in Word.objects.filter(lexicon=self.lexicon).values_list('term', 'id')}
-        count_words = len(self.cleaned_data)
 
         for entry in self.cleaned_entries:
             word_pk = words[entry.word_term]
             entry.word_id = word_pk
-        Entry.objects.bulk_create(self.cleaned_entries, batch_size=100)
+        self.insert(Entry, self.cleaned_entries)
 
-        for entry in self.cleaned_entries:
-            entry.gramcats.set(entry.clean_gramcats)
-            count_entries += 1
+        self.insert_labels()
+        examples = self.insert_relations(self.cleaned_entries, words)
+        self.refresh_model_words(words)
 
-            for example in entry.clean_examples:
-                example.entry_id = entry.pk
-                example.save()
-                count_examples += 1
+        self.validate_unique_together()
+        self.lexicon.bump_data_version()
 
-            try:
-                entry.clean_conjugation.entry_id = entry.pk
-                entry.clean_conjugation.save()
-            except AttributeError:
-                pass
+        self.stdout.write("Imported: %s words, %s entries, %s examples" %
+                          (len(self.cleaned_data), len(self.cleaned_entries), len(examples)))
+        self.write_insert_stats()
+
+    def write_insert_stats(self):
+        for table, count, seconds in self.insert_stats:
+            self.stdout.write("INFO\t{}: {} rows inserted in {:.2f}s".format(table, count, seconds))
 
-        # store labels & create relations with entries
+    def insert_labels(self):
+        # store labels
         # NOTE only create not existing labels. For example ar-es
         # content is splited on several XLSX files so labels may
         # already exist.
         existing_labels = self.lexicon.labels.values_list("name", flat=True)
         new_labels = self.cleaned_labels - set(existing_labels)
-        Label.objects.bulk_create([
+        self.insert(Label, [
             Label(name=label, lexicon=self.lexicon) for label in new_labels
-        ], batch_size=200)
+        ])
 
+    def insert_relations(self, entries, words):
+        """
+        Insert gramcats, labels, examples and conjugations of the entries.
+        Entries have PK after being inserted so relations can be inserted
+        in bulk too (instead of a query per entry).
+        """
+        EntryGramcat = Entry.gramcats.through
+        LabelEntry = Label.entries.through
         # cache labels to optimize get query
-        all_labels = {label.name: label for label in self.lexicon.labels.all()}
-        for entry in self.cleaned_entries:
+        all_labels = {label.name: label.pk for label in self.lexicon.labels.all()}
+
+        entry_gramcats = []
+        entry_labels = []
+        examples = []
+        conjugations = []
+        for entry in entries:
+            gramcat_ids = {gramcat.pk for gramcat in entry.clean_gramcats}
+            entry_gramcats.extend(
+                EntryGramcat(entry_id=entry.pk, gramaticalcategory_id=gramcat_id)
+                for gramcat_id in gramcat_ids
+            )
+
             if getattr(entry, "label", None):
-                label_model = all_labels[entry.label]
-                label_model.entries.add(entry)
+                entry_labels.append(LabelEntry(label_id=all_labels[entry.label], entry_id=entry.pk))
+
+            for example in entry.clean_examples:
+                example.entry_id = entry.pk
+                examples.append(example)
+
+            conjugation = getattr(entry, 'clean_conjugation', None)
+            if conjugation is not None:
+                conjugation.entry_id = entry.pk
+                # parse it here because loaders don't call save()
+                try:
+                    conjugation.refresh_parsed(words)
+                except ValidationError:
+                    # keep content unparsed (e.g. imported using `allow_partial`)
+                    conjugation.parsed = ''
+                    conjugation.model_word_ref_id = None
+                conjugations.append(conjugation)
+
+        self.insert(EntryGramcat, entry_gramcats)
+        self.insert(LabelEntry, entry_labels)
+        self.insert(Example, examples)
+        self.insert(VerbalConjugation, conjugations)
+        return examples
+
+    def refresh_model_words(self, words):
+        """
+        Conjugations already stored may reference model verbs which have
+        just been imported (or replaced) so their reference is resolved
+        again (see VerbalConjugation.model_word_ref).
+        """
+        updated = VerbalConjugation.objects.filter(
+            entry__word__lexicon=self.lexicon).refresh_model_word_refs(words)
+        if updated and self.verbosity >= 2:
+            self.stdout.write("INFO\t{} conjugations model word resolved".format(updated))
+
+    def diff_database(self):
+        """
+        Compare cleaned data with the data of the lexicon stored on the
+        database. Words are matched by term and entries by translation
+        (only entries imported by importdata, diatopic variations are kept).
+        """
+        changeset = Changeset()
+
+        entries_qs = Entry.objects.filter(variation__isnull=True).select_related(
+            'conjugation').prefetch_related('gramcats', 'labels', 'examples')
+        db_words = {
+            word.term: word for word in
+            self.lexicon.words.prefetch_related(Prefetch('entries', queryset=entries_qs))
+        }
+
+        for term, word in self.cleaned_data.items():
+            try:
+                db_word = db_words.pop(term)
+            except KeyError:
+                changeset.new_words.append(word)
+                changeset.new_entries.extend(word.clean_entries)
+                continue
+
+            db_entries = defaultdict(list)
+            for db_entry in db_word.entries.all():
+                db_entries[db_entry.translation].append(db_entry)
+
+            for entry in word.clean_entries:
+                try:
+                    # same translation may appear with different gramcats
+                    db_entry = db_entries[entry.translation].pop(0)
+                except IndexError:
+                    changeset.new_entries.append(entry)
+                    continue
+
+                entry.pk = db_entry.pk
+                entry.word_id = db_word.pk
+                if entry_values(entry) != db_entry_values(db_entry):
+                    changeset.changed_entries.append(entry)
+
+            changeset.deleted_entries.extend(
+                db_entry.pk for pending in db_entries.values() for db_entry in pending)
+
+        if self.prune:
+            # words not included on the input file
+            changeset.deleted_words.extend(word.pk for word in db_words.values())
+
+        return changeset
+
+    @transaction.atomic
+    def update_database(self, changeset):
+        self.insert_stats = []
+        self.progress.start(TaskProgress.WRITING)
+
+        Word.objects.filter(pk__in=changeset.deleted_words).delete()
+        Entry.objects.filter(pk__in=changeset.deleted_entries).delete()
+
+        # relations of changed entries are replaced
+        changed = [entry.pk for entry in changeset.changed_entries]
+        Entry.gramcats.through.objects.filter(entry_id__in=changed).delete()
+        Label.entries.through.objects.filter(entry_id__in=changed).delete()
+        Example.objects.filter(entry_id__in=changed).delete()
+        VerbalConjugation.objects.filter(entry_id__in=changed).delete()
+
+        self.insert(Word, changeset.new_words)
+        words = {w[0]: w[1] for w in Word.objects.filter(lexicon=self.lexicon).values_list('term', 'id')}
+        for entry in changeset.new_entries:
+            entry.word_id = words[entry.word_term]
+        self.insert(Entry, changeset.new_entries)
+
+        self.insert_labels()
+        self.insert_relations(changeset.new_entries + changeset.changed_entries, words)
+        self.refresh_model_words(words)
 
         self.validate_unique_together()
+        if changeset:
+            self.lexicon.bump_data_version()
 
-        self.stdout.write("Imported: %s words, %s entries, %s examples" %
-                          (count_words, count_entries, count_examples))
+        self.write_insert_stats()
 
     def validate_unique_together(self):
         """
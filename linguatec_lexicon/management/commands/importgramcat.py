@@ -1,7 +1,7 @@
 import pandas as pd
 from django.core.management.base import BaseCommand, CommandError
 
-from linguatec_lexicon.models import GramaticalCategory
+from linguatec_lexicon.models import GramaticalCategory, Lexicon
 
 
 class Command(BaseCommand):
@@ -34,6 +34,9 @@ class Command(BaseCommand):
 
         self.loaddata(csv_files)
 
+        # gramatical categories are shared by all the lexicons
+        Lexicon.objects.all().bump_data_version()
+
         if self.verbosity >= 1:
             self.stdout.write(
                 "Imported %d object(s) from %d file(s)"
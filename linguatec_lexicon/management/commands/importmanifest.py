@@ -0,0 +1,246 @@
+"""
+Import several files (data and diatopic variations) described by a JSON
+manifest. Paths are relative to the manifest and can be glob patterns:
+
+    {
+        "files": [
+            {"file": "vocabulario-castellano-aragones-*.xlsx", "lexicon": "es-ar"},
+            {"file": "ar-es/*.xlsx", "lexicon": "ar-es"},
+            {"file": "variedades/RIBAGORZA-benasques-*.xlsx", "lexicon": "es-ar", "variation": "Benasqués"}
+        ]
+    }
+
+Files are parsed and validated in parallel (worker processes) and written
+to the database one by one by the main process. Data files are imported
+before diatopic variations (which reference the words of the lexicon).
+
+"""
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from functools import partial
+from io import StringIO
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from linguatec_lexicon import loaders
+from linguatec_lexicon.management.commands import importdata, importvariation
+from linguatec_lexicon.models import (GramaticalCategory, ImportRecord,
+                                      Lexicon, Word)
+
+# data words should exist before importing their variations
+STAGES = [
+    ('importdata', importdata),
+    ('importvariation', importvariation),
+]
+
+# data shared with worker processes (set before starting them)
+_shared = {}
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def create_command(item, **options):
+    """Create the import command of the item with its options configured."""
+    module = dict(STAGES)[item['stage']]
+    command = module.Command(stdout=StringIO(), stderr=StringIO())
+
+    args = [item['lexicon'], item['path']]
+    if item.get('variation'):
+        args += ['--variation', item['variation']]
+    parser = command.create_parser('manage.py', item['stage'])
+    defaults = vars(parser.parse_args(args))
+    defaults.update(options)
+    command.prepare(**defaults)
+
+    # reuse data retrieved once instead of one time per file
+    command.__dict__['_gramcats'] = _shared['gramcats']
+    if item['stage'] == 'importvariation':
+        command.__dict__['_words'] = _shared['words'][item['lexicon_id']]
+    return command
+
+
+def parse_file(item, **options):
+    """Parse and validate a file. It's run by worker processes."""
+    try:
+        command = create_command(item, **options)
+        command.parse()
+    except Exception as e:
+        return item, {'errors': [{'message': str(e)}]}
+
+    return item, {attr: getattr(command, attr) for attr in command.parsed_attrs}
+
+
+class Command(BaseCommand):
+    help = 'Import data and diatopic variation files described by a JSON manifest'
+
+    def add_arguments(self, parser):
+        parser.add_argument('manifest', type=str)
+        parser.add_argument(
+            '--jobs', type=int, default=os.cpu_count(),
+            help="Number of processes used to parse the files. By default: number of CPUs",
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help="Import files even if their content hasn't changed since the last import.",
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true', dest='dry_run',
+            help="Just validate input files; don't actually import to database.",
+        )
+        parser.add_argument(
+            '--loader', choices=loaders.LOADERS, default='bulk',
+            help="How rows are inserted (see importdata). By default: bulk",
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        self.dry_run = options['dry_run']
+        self.force = options['force']
+        self.jobs = max(options['jobs'] or 1, 1)
+        self.command_options = {'dry_run': self.dry_run, 'loader': options['loader']}
+
+        items = self.read_manifest(options['manifest'])
+        failed = []
+        for stage, _ in STAGES:
+            stage_items = self.exclude_unchanged([item for item in items if item['stage'] == stage])
+            if stage_items:
+                failed += self.run_stage(stage, stage_items)
+
+        if failed:
+            raise CommandError("{} files were not imported: {}".format(
+                len(failed), ', '.join(item['file'] for item in failed)))
+
+    def read_manifest(self, path):
+        try:
+            with open(path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError("Invalid manifest '{}': {}".format(path, e))
+
+        base_path = os.path.dirname(os.path.abspath(path))
+        items = []
+        for entry in manifest.get('files', []):
+            try:
+                pattern, lexicon = entry['file'], entry['lexicon']
+            except KeyError as e:
+                raise CommandError("Invalid manifest '{}': missing key {}".format(path, e))
+            items += self.read_manifest_entry(base_path, pattern, lexicon, entry.get('variation'))
+        return items
+
+    def read_manifest_entry(self, base_path, pattern, lexicon, variation):
+        try:
+            lexicon_id = Lexicon.objects.get_by_slug(lexicon).pk
+        except Lexicon.DoesNotExist:
+            raise CommandError('Error: There is not a lexicon with that code: ' + lexicon)
+
+        paths = sorted(glob.glob(os.path.join(base_path, pattern)))
+        if not paths:
+            raise CommandError("File matching '{}' not found".format(pattern))
+        if variation and len(paths) > 1:
+            raise CommandError("Several files match variation file '{}'".format(pattern))
+
+        return [{
+            'stage': 'importvariation' if variation else 'importdata',
+            'file': file_path if os.path.isabs(pattern) else os.path.relpath(file_path, base_path),
+            'path': file_path,
+            'lexicon': lexicon,
+            'lexicon_id': lexicon_id,
+            'variation': variation,
+            'sha256': file_sha256(file_path),
+        } for file_path in paths]
+
+    def exclude_unchanged(self, items):
+        if self.force:
+            return items
+
+        records = set(ImportRecord.objects.values_list('lexicon_id', 'path', 'sha256'))
+        pending = []
+        for item in items:
+            if (item['lexicon_id'], item['file'], item['sha256']) in records:
+                self.stdout.write("[skip] {} (unchanged)".format(item['file']))
+            else:
+                pending.append(item)
+        return pending
+
+    def run_stage(self, stage, items):
+        _shared['gramcats'] = {g.abbreviation: g for g in GramaticalCategory.objects.all()}
+        if stage == 'importvariation':
+            _shared['words'] = {
+                lexicon_id: {w.term: w for w in Word.objects.filter(lexicon_id=lexicon_id).with_gramcats()}
+                for lexicon_id in {item['lexicon_id'] for item in items}
+            }
+
+        failed = []
+        start = time.perf_counter()
+        for item, parsed in self.parse_files(items):
+            if not self.write(item, parsed):
+                failed.append(item)
+
+        self.stdout.write("{}: {} files processed in {:.2f}s".format(
+            stage, len(items), time.perf_counter() - start))
+        return failed
+
+    def parse_files(self, items):
+        """
+        Yield the files parsed (in any order). Writes are done by the main
+        process while worker processes go on parsing.
+        """
+        if self.jobs == 1 or len(items) == 1:
+            for item in items:
+                yield parse_file(item, **self.command_options)
+            return
+
+        # forked processes should open their own database connections
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        with context.Pool(min(self.jobs, len(items))) as pool:
+            yield from pool.imap_unordered(partial(parse_file, **self.command_options), items)
+
+    def write(self, item, parsed):
+        if parsed['errors']:
+            self.stdout.write(self.style.ERROR("[error] {}: {} errors".format(item['file'], len(parsed['errors']))))
+            if self.verbosity >= 2:
+                for error in parsed['errors']:
+                    self.stdout.write(self.style.ERROR(json.dumps(error, ensure_ascii=False)))
+            return False
+
+        if self.dry_run:
+            self.stdout.write(self.style.SUCCESS("[valid] {}".format(item['file'])))
+            return True
+
+        command = create_command(item, **self.command_options)
+        command.__dict__.update(parsed)
+        try:
+            with transaction.atomic():
+                if item['stage'] == 'importdata':
+                    # update mode also works on empty lexicons (everything is new)
+                    changeset = command.diff_database()
+                    command.update_database(changeset)
+                    summary = str(changeset)
+                else:
+                    command.replace = True
+                    command.write_to_database()
+                    summary = "{} entries".format(len(command.entries))
+
+                ImportRecord.objects.update_or_create(
+                    lexicon=command.lexicon, path=item['file'],
+                    defaults={'variation': command.variation if item['variation'] else None,
+                              'sha256': item['sha256']},
+                )
+        except CommandError as e:
+            self.stdout.write(self.style.ERROR("[error] {}: {}".format(item['file'], e)))
+            return False
+
+        self.stdout.write(self.style.SUCCESS("[imported] {}: {}".format(item['file'], summary)))
+        return True
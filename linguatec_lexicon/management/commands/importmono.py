@@ -9,7 +9,8 @@ from odf.table import Table, TableCell, TableRow
 from odf.text import P
 from openpyxl import load_workbook
 
-from linguatec_lexicon.models import Entry, Lexicon, Word
+from linguatec_lexicon.models import Entry, Lexicon, TaskProgress, Word
+from linguatec_lexicon.progress import ProgressReporter
 
 
 def is_row_empty(row):
@@ -19,7 +20,19 @@ def is_row_empty(row):
     return True
 
 
+def error_messages(error):
+    """Split the errors of a row in one message per column (JSON output)."""
+    for key, value in error["errors"].items():
+        yield {
+            "word": f"#{error['row']}: {error['term']}",
+            "column": key,
+            "message": value,
+        }
+
+
 class Command(BaseCommand):
+    # progress reporter (see progress module) only available using call_command
+    stealth_options = ('progress',)
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -31,7 +44,6 @@ class Command(BaseCommand):
         parser.add_argument('--etimol-rich-text', action='store_true',
                             help="Import rich text from ODS file (WARNING: VERY EXPENSIVE operation)")
 
-    @transaction.atomic
     def handle(self, *args, **options):
         self.set_options(**options)
         # check that a lexicon with that code exist
@@ -40,24 +52,25 @@ class Command(BaseCommand):
         except Lexicon.DoesNotExist:
             raise CommandError('Error: There is not a lexicon with that code: ' + self.lexicon_code)
 
-        if self.truncate:
-            Word.objects.filter(lexicon=self.lexicon).delete()
-
         self._words = set()
 
-        # use temp lexicon and if everything is ok, then change to the real one
-        self._lexicon = self.lexicon
-        self.lexicon = Lexicon.objects.create(name="Temp Lexicon", src_language="99", dst_language="99")
-
         self.xlsx = load_workbook(self.input_file, read_only=True)
         self.ods = self.xlsx2ods()
         self.ods_table = self.ods.getElementsByType(Table)[0]
         sheet = self.xlsx.active
 
+        # first row is the header
+        self.progress.start(TaskProgress.VALIDATING, total=sheet.max_row - 1 if sheet.max_row else None)
+
+        # validate all the rows before writing anything (outside of a
+        # transaction so progress can be reported while validating)
+        rows = []
         errors = []
+        messages = []
         for i, row in enumerate(sheet.iter_rows()):
             if i == 0:
                 continue
+            self.progress.update(i, messages)
 
             row_number = i + 1
             if is_row_empty(row):
@@ -71,36 +84,51 @@ class Command(BaseCommand):
                     "term": wrow.term,
                     "errors": wrow.errors,
                 })
+                messages.extend(error_messages(errors[-1]))
                 continue
 
-            word = Word(
-                lexicon=self.lexicon,
-                term=wrow.term,
-                etimol=wrow.etimol,
-            )
-            word.save()
-            entries = [Entry(word=word, translation=wrow.definition)]
-            if wrow.definition2:
-                entries.append(Entry(word=word, translation=wrow.definition2))
-            word.entries.bulk_create(entries)
+            rows.append(wrow)
 
             # TODO: think how to handle too many errors
             if len(errors) >= 100:
                 break
 
+        # errors of the last row
+        self.progress.update(self.progress.rows, messages)
+
+        self.write_to_database(rows, errors)
+
+    @transaction.atomic
+    def write_to_database(self, rows, errors):
+        if self.truncate:
+            Word.objects.filter(lexicon=self.lexicon).delete()
+
         if errors:
-            self.lexicon.delete()
             self.print_errors(errors, format="json")
         else:
-            self.lexicon.words.update(lexicon=self._lexicon)
-            self.lexicon.delete()
-            self.lexicon = self._lexicon
+            self.progress.start(TaskProgress.WRITING, total=len(rows))
+            for i, wrow in enumerate(rows, start=1):
+                word = Word(
+                    lexicon=self.lexicon,
+                    term=wrow.term,
+                    etimol=wrow.etimol,
+                )
+                word.save()
+                entries = [Entry(word=word, translation=wrow.definition)]
+                if wrow.definition2:
+                    entries.append(Entry(word=word, translation=wrow.definition2))
+                word.entries.bulk_create(entries)
+                self.progress.update(i)
+
+        if self.truncate or not errors:
+            self.lexicon.bump_data_version()
 
     def set_options(self, **options):
         self.input_file = options['input_file']
         self.lexicon_code = options['lexicon_code']
         self.truncate = options['truncate']
         self.etimol_rich_text = options['etimol_rich_text']
+        self.progress = options.get('progress') or ProgressReporter(self.input_file)
 
     def xlsx2ods(self):
         # Convert xlsx to ods (required to be able to extract rich text)
@@ -137,14 +165,8 @@ class Command(BaseCommand):
     def print_errors(self, errors, format="json"):
         for error in errors:
             if format == "json":
-                for key, value in error["errors"].items():
-                    self.stdout.write(self.style.ERROR(
-                        json.dumps({
-                            "word": f"#{error['row']}: {error['term']}",
-                            "column": key,
-                            "message": value,
-                        })
-                    ))
+                for message in error_messages(error):
+                    self.stdout.write(self.style.ERROR(json.dumps(message)))
 
                 continue
 
@@ -1,3 +1,4 @@
+import json
 import os
 
 import pandas as pd
@@ -6,12 +7,20 @@ from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from django.utils.functional import cached_property
 
+from linguatec_lexicon import loaders
 from linguatec_lexicon.models import (DiatopicVariation, Entry,
-                                      GramaticalCategory, Lexicon, Word)
+                                      GramaticalCategory, Lexicon,
+                                      TaskProgress, Word)
+from linguatec_lexicon.progress import ProgressReporter
 
 
 class Command(BaseCommand):
     help = 'Imports diatopic variation Excel into the database'
+    default_batch_size = 500
+    # attributes which store the result of parse()
+    parsed_attrs = ['errors', 'entries', 'words_count', 'rows_count']
+    # progress reporter (see progress module) only available using call_command
+    stealth_options = ('progress',)
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -27,6 +36,20 @@ class Command(BaseCommand):
             '--dry-run', action='store_true', dest='dry_run',
             help="Just validate input file; don't actually import to database.",
         )
+        parser.add_argument(
+            '--replace', action='store_true',
+            help="Delete the entries of the variation previously imported on the lexicon.",
+        )
+        parser.add_argument(
+            '--batch-size', type=int,
+            help=("Controls how many objects are created in a single query. "
+                  "Directly passed to bulk_create. By default: {}").format(self.default_batch_size),
+        )
+        parser.add_argument(
+            '--loader', choices=loaders.LOADERS, default='bulk',
+            help=("How rows are inserted: 'bulk' (bulk_create) or 'copy' (PostgreSQL COPY, "
+                  "fallback to bulk on other databases). By default: bulk"),
+        )
 
     def clean_variation(self, value):
         if self.dry_run:
@@ -40,10 +63,41 @@ class Command(BaseCommand):
                 'Diatopic variation "{}" does not exist'.format(value))
 
     def handle(self, *args, **options):
+        self.prepare(**options)
+        self.parse()
+
+        if self.errors:
+            self.stdout.write(self.style.ERROR(
+                "Detected {} errors!".format(len(self.errors))))
+            if self.verbosity > 2:
+                for error in self.errors:
+                    self.stdout.write(self.style.ERROR(json.dumps(error, default=str)))
+        else:
+            if not self.dry_run:
+                # Write data into the database
+                self.write_to_database()
+            self.stdout.write(self.style.SUCCESS(
+                'Successfully imported file "{}" of diatopic variation "{}"'.format(self.input_file, options['variation'])))
+
+        if self.verbosity > 1:
+            self.stdout.write(
+                "Excel stats: {} rows | {} valid rows | {} invalid rows".format(
+                    self.rows_count,
+                    self.words_count,
+                    len(self.errors),
+                )
+            )
+
+    def prepare(self, **options):
+        """Validate options and initialize the command (see importmanifest)."""
         self.input_file = options['input_file']
         self.dry_run = options['dry_run']
         self.verbosity = options['verbosity']
         self.lexicon_code = options['lexicon_code']
+        self.replace = options['replace']
+        self.progress = options.get('progress') or ProgressReporter(self.input_file)
+        self.loader = loaders.get_loader(
+            options['loader'], options['batch_size'] or self.default_batch_size)
 
         # validate input_file
         _, file_extension = os.path.splitext(self.input_file)
@@ -67,40 +121,24 @@ class Command(BaseCommand):
         except Lexicon.DoesNotExist:
             raise CommandError('Error: There is not a lexicon with that code: ' + self.lexicon_code)
 
+    def parse(self):
+        """Read the input file and validate its data."""
         self.xlsx = pd.read_excel(self.input_file, sheet_name=None, header=None, usecols="A:C",
                                   names=['term', 'gramcats', 'translations'])
+        self.rows_count = sum([len(sheet.index) for sheet in self.xlsx.values()])
+        self.progress.start(TaskProgress.VALIDATING, total=self.rows_count)
         self.populate_models()
 
-        if self.errors:
-            self.stdout.write(self.style.ERROR(
-                "Detected {} errors!".format(len(self.errors))))
-            if self.verbosity > 2:
-                for error in self.errors:
-                    values = [str(value) or '' for value in error.values()]
-                    self.stdout.write(self.style.ERROR('    '.join(values)))
-        else:
-            if not self.dry_run:
-                # Write data into the database
-                self.write_to_database()
-            self.stdout.write(self.style.SUCCESS(
-                'Successfully imported file "{}" of diatopic variation "{}"'.format(self.input_file, options['variation'])))
-
-        if self.verbosity > 1:
-            self.stdout.write(
-                "Excel stats: {} rows | {} valid rows | {} invalid rows".format(
-                    sum([len(sheet.index) for sheet in self.xlsx.values()]),
-                    self.words_count,
-                    len(self.errors),
-                )
-            )
-
     def populate_models(self):
         self.errors = []
         self.entries = []
         self.words_count = 0
 
+        count = 0
         for sheet_name, sheet in self.xlsx.items():
             for row in sheet.itertuples():
+                count += 1
+                self.progress.update(count, self.errors)
                 word = self.retrieve_word(row.Index + 1, row.term)
                 if word is None:
                     continue
@@ -119,6 +157,9 @@ class Command(BaseCommand):
 
                 self.words_count += 1
 
+        # errors of the last row
+        self.progress.update(count, self.errors)
+
     def populate_entries(self, word, gramcats, translations_raw):
         word.clean_entries = []
 
@@ -217,15 +258,27 @@ class Command(BaseCommand):
 
     @cached_property
     def _words(self):
-        qs = Word.objects.filter(lexicon=self.lexicon)
+        # gramcats are retrieved to provide default value (avoid a query per row)
+        qs = Word.objects.filter(lexicon=self.lexicon).with_gramcats()
         return {w.term: w for w in qs}
 
     @transaction.atomic
     def write_to_database(self):
-        Entry.objects.bulk_create(self.entries, batch_size=100)
+        self.progress.start(TaskProgress.WRITING, total=len(self.entries))
+        if self.replace:
+            Entry.objects.filter(word__lexicon=self.lexicon, variation=self.variation).delete()
+
+        self.loader.create(Entry, self.entries)
+        self.progress.update(len(self.entries))
+
+        EntryGramcat = Entry.gramcats.through
+        self.loader.create(EntryGramcat, [
+            EntryGramcat(entry_id=entry.pk, gramaticalcategory_id=gramcat_id)
+            for entry in self.entries
+            for gramcat_id in {gramcat.pk for gramcat in entry.clean_gramcats}
+        ])
 
-        for entry in self.entries:
-            entry.gramcats.set(entry.clean_gramcats)
+        self.lexicon.bump_data_version()
 
         count_entries = len(self.entries)
         self.stdout.write("Imported: {} entries of {} words.".format(
@@ -236,6 +236,10 @@ export LINGUATEC_VARIANTS_PATH="~/trabajo/dgpl/linguatec-v5/variedades/"
 time ./manage.py importdata -v3 es-ar ~/trabajo/dgpl/linguatec-v5/vocabulario-castellano-aragones-2021-08-12.xlsx
 time ./manage.py initialize_staging --import-aragonese
 
+# or import all the files described by a manifest (parsed in parallel,
+# files not modified since the previous run are skipped)
+#time ./manage.py importmanifest ~/trabajo/dgpl/linguatec-v5/manifest.json
+
 #./manage.py initialize_staging --validate-variations
 
 time ./manage.py initialize_staging --import-variations
@@ -55,6 +55,8 @@ class Command(BaseCommand):
                 entries.append(entry)
 
         Entry.objects.bulk_update(entries, ['marked_translation'], batch_size=self.batch_size)
+        if entries:
+            lexicon.bump_data_version()
 
         return len(entries), qs.count()
 
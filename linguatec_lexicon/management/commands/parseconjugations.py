@@ -0,0 +1,48 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from linguatec_lexicon.models import Lexicon, VerbalConjugation
+
+
+class Command(BaseCommand):
+    help = 'Parse raw verbal conjugations and store the result (and the model word)'
+    default_batch_size = 100
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            help=("Controls how many conjugations are updated in a single query "
+                  "Directly passed to bulk_update. By default: {}").format(self.default_batch_size),
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size'] or self.default_batch_size
+
+        for lexicon in Lexicon.objects.all():
+            updated = self.parse_conjugations(lexicon)
+            self.stdout.write("Lexicon {} parsed {} conjugations".format(lexicon.slug, updated))
+
+    @transaction.atomic
+    def parse_conjugations(self, lexicon):
+        # cache lexicon words to resolve model words without extra queries
+        words = {word[0]: word[1] for word in lexicon.words.values_list('term', 'id')}
+
+        conjugations = []
+        qs = VerbalConjugation.objects.filter(entry__word__lexicon=lexicon).select_related('entry__word')
+        for conjugation in qs:
+            try:
+                conjugation.refresh_parsed(words)
+            except ValidationError as e:
+                msg = "[{}] '{}' Invalid conjugation: {}".format(
+                    lexicon.slug, conjugation.entry.word.term, e.message)
+                self.stdout.write(self.style.ERROR(msg))
+                continue
+            conjugations.append(conjugation)
+
+        VerbalConjugation.objects.bulk_update(
+            conjugations, ['parsed', 'model_word_ref'], batch_size=self.batch_size)
+        if conjugations:
+            lexicon.bump_data_version()
+
+        return len(conjugations)
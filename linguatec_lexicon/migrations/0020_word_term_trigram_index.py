@@ -0,0 +1,37 @@
+from django.contrib.postgres.operations import BtreeGinExtension
+from django.db import migrations
+
+# NOTE: GIN indexes are PostgreSQL specific so they are not declared on
+# Word.Meta.indexes (SQLite is used to run the tests).
+INDEX_NAME = 'linguatec_lexicon_word_lexicon_term_trgm'
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    # btree_gin allows combining lexicon (integer) and term (trigram) on
+    # the same index so searches scoped by lexicon are a single index scan.
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS {} ON linguatec_lexicon_word '
+        'USING gin (lexicon_id, term gin_trgm_ops)'.format(INDEX_NAME)
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('DROP INDEX IF EXISTS {}'.format(INDEX_NAME))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0019_word_etimol'),
+    ]
+
+    operations = [
+        BtreeGinExtension(),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,37 @@
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations
+
+# NOTE: GiST indexes are PostgreSQL specific so they are not declared on
+# Word.Meta.indexes (SQLite is used to run the tests).
+INDEX_NAME = 'linguatec_lexicon_word_lexicon_term_trgm_gist'
+
+
+def create_trigram_gist_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    # GiST (unlike GIN) supports ordering by trigram distance `<->` so
+    # nearest neighbour queries (ORDER BY ... LIMIT k) stop after k rows.
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS {} ON linguatec_lexicon_word '
+        'USING gist (lexicon_id, term gist_trgm_ops)'.format(INDEX_NAME)
+    )
+
+
+def drop_trigram_gist_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('DROP INDEX IF EXISTS {}'.format(INDEX_NAME))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0020_word_term_trigram_index'),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.RunPython(create_trigram_gist_index, drop_trigram_gist_index),
+    ]
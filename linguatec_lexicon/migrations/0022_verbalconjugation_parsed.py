@@ -0,0 +1,24 @@
+# Generated by Django 4.2.20 on 2026-10-18 11:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0021_word_term_trigram_gist_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='verbalconjugation',
+            name='model_word_ref',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Word used as conjugation model (resolved from parsed content).', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='linguatec_lexicon.word'),
+        ),
+        migrations.AddField(
+            model_name='verbalconjugation',
+            name='parsed',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Parsed content (JSON).'),
+        ),
+    ]
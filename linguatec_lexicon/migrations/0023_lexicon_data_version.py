@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-18 11:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0022_verbalconjugation_parsed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lexicon',
+            name='data_version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Incremented every time the data of the lexicon changes.'),
+        ),
+    ]
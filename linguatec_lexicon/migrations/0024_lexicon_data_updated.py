@@ -0,0 +1,19 @@
+# Generated by Django 4.2.20 on 2026-10-18 11:13
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0023_lexicon_data_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lexicon',
+            name='data_updated',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, help_text='Last time the data of the lexicon changed.'),
+        ),
+    ]
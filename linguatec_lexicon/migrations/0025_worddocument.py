@@ -0,0 +1,22 @@
+# Generated by Django 4.2.20 on 2026-10-18 11:16
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0024_lexicon_data_updated'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WordDocument',
+            fields=[
+                ('word', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='document', serialize=False, to='linguatec_lexicon.word')),
+                ('data_version', models.PositiveIntegerField()),
+                ('content', models.TextField(verbose_name='Serialized word (JSON).')),
+            ],
+        ),
+    ]
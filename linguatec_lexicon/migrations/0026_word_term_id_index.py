@@ -0,0 +1,17 @@
+# Generated by Django 4.2.20 on 2026-10-18 11:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0025_worddocument'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['term', 'id'], name='word-term-id'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.20 on 2026-10-18 11:22
+
+import unicodedata
+
+from django.db import migrations, models
+
+# frozen copy of utils.normalize_term at the time of this migration
+TERM_PUNCTUATION_SIGNS = '¡!¿?'
+LETTER_MARKS = {'\u0303': 'n', '\u0327': 'c'}
+
+
+def normalize_term(term):
+    term = unicodedata.normalize('NFD', term.casefold())
+    chars = []
+    for char in term:
+        if unicodedata.combining(char) and (not chars or LETTER_MARKS.get(char) != chars[-1]):
+            continue
+        if char in TERM_PUNCTUATION_SIGNS:
+            continue
+        chars.append(char)
+
+    term = unicodedata.normalize('NFC', ''.join(chars))
+    return ' '.join(term.split())
+
+
+def populate_normalized_term(apps, schema_editor):
+    Word = apps.get_model('linguatec_lexicon', 'Word')
+    words = []
+    for word in Word.objects.only('id', 'term').iterator(chunk_size=1000):
+        word.normalized_term = normalize_term(word.term)
+        words.append(word)
+        if len(words) == 1000:
+            Word.objects.bulk_update(words, ['normalized_term'])
+            words = []
+    Word.objects.bulk_update(words, ['normalized_term'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0026_word_term_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='word',
+            name='normalized_term',
+            field=models.CharField(blank=True, editable=False, help_text='Search key (see utils.normalize_term).', max_length=64),
+        ),
+        migrations.RunPython(populate_normalized_term, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['lexicon', 'normalized_term'], name='word-lexicon-normalized-term', opclasses=['int4_ops', 'varchar_pattern_ops']),
+        ),
+    ]
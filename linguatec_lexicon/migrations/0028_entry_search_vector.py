@@ -0,0 +1,53 @@
+# Generated by Django 4.2.20 on 2026-10-18 11:25
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# NOTE: triggers and GIN indexes are PostgreSQL specific (SQLite is used
+# to run the tests) so search is resolved using regex on other backends.
+INDEX_NAME = 'linguatec_lexicon_entry_search_vector'
+TRIGGER_NAME = 'linguatec_lexicon_entry_search_vector_update'
+
+
+def create_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    # 'simple' configuration because there isn't an Aragonese dictionary
+    # (lowercase without stemming nor stop words).
+    schema_editor.execute(
+        'CREATE TRIGGER {} BEFORE INSERT OR UPDATE OF translation '
+        'ON linguatec_lexicon_entry FOR EACH ROW EXECUTE FUNCTION '
+        "tsvector_update_trigger(search_vector, 'pg_catalog.simple', translation)".format(TRIGGER_NAME)
+    )
+    schema_editor.execute(
+        "UPDATE linguatec_lexicon_entry SET search_vector = to_tsvector('pg_catalog.simple', translation)"
+    )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS {} ON linguatec_lexicon_entry '
+        'USING gin (search_vector)'.format(INDEX_NAME)
+    )
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('DROP INDEX IF EXISTS {}'.format(INDEX_NAME))
+    schema_editor.execute('DROP TRIGGER IF EXISTS {} ON linguatec_lexicon_entry'.format(TRIGGER_NAME))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0027_word_normalized_term'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entry',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_vector, drop_search_vector),
+    ]
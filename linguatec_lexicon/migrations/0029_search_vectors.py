@@ -0,0 +1,122 @@
+# Generated by Django 4.2.20 on 2026-10-18 11:26
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+# NOTE: triggers and GIN indexes are PostgreSQL specific (SQLite is used
+# to run the tests) so search is resolved using icontains on other backends.
+# Examples and etymologies are indexed using the text search configuration
+# of their lexicon (Lexicon.search_config).
+CREATE_SQL = """
+CREATE FUNCTION linguatec_lexicon_word_etimol_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.etimol_vector := to_tsvector(
+        COALESCE((SELECT search_config FROM linguatec_lexicon_lexicon WHERE id = NEW.lexicon_id),
+                 'simple')::regconfig,
+        NEW.etimol);
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER linguatec_lexicon_word_etimol_vector_update
+    BEFORE INSERT OR UPDATE OF etimol, lexicon_id ON linguatec_lexicon_word
+    FOR EACH ROW EXECUTE FUNCTION linguatec_lexicon_word_etimol_vector();
+
+CREATE FUNCTION linguatec_lexicon_example_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := to_tsvector(
+        COALESCE((SELECT l.search_config FROM linguatec_lexicon_entry e
+                  JOIN linguatec_lexicon_word w ON w.id = e.word_id
+                  JOIN linguatec_lexicon_lexicon l ON l.id = w.lexicon_id
+                  WHERE e.id = NEW.entry_id),
+                 'simple')::regconfig,
+        NEW.phrase);
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER linguatec_lexicon_example_search_vector_update
+    BEFORE INSERT OR UPDATE OF phrase, entry_id ON linguatec_lexicon_example
+    FOR EACH ROW EXECUTE FUNCTION linguatec_lexicon_example_search_vector();
+
+CREATE FUNCTION linguatec_lexicon_lexicon_search_config() RETURNS trigger AS $$
+BEGIN
+    UPDATE linguatec_lexicon_word
+        SET etimol_vector = to_tsvector(NEW.search_config::regconfig, etimol)
+        WHERE lexicon_id = NEW.id;
+    UPDATE linguatec_lexicon_example
+        SET search_vector = to_tsvector(NEW.search_config::regconfig, phrase)
+        WHERE entry_id IN (
+            SELECT e.id FROM linguatec_lexicon_entry e
+            JOIN linguatec_lexicon_word w ON w.id = e.word_id
+            WHERE w.lexicon_id = NEW.id);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER linguatec_lexicon_lexicon_search_config_update
+    AFTER UPDATE OF search_config ON linguatec_lexicon_lexicon
+    FOR EACH ROW WHEN (OLD.search_config IS DISTINCT FROM NEW.search_config)
+    EXECUTE FUNCTION linguatec_lexicon_lexicon_search_config();
+
+UPDATE linguatec_lexicon_word w
+    SET etimol_vector = to_tsvector(l.search_config::regconfig, w.etimol)
+    FROM linguatec_lexicon_lexicon l WHERE l.id = w.lexicon_id;
+
+UPDATE linguatec_lexicon_example x
+    SET search_vector = to_tsvector(l.search_config::regconfig, x.phrase)
+    FROM linguatec_lexicon_entry e, linguatec_lexicon_word w, linguatec_lexicon_lexicon l
+    WHERE e.id = x.entry_id AND w.id = e.word_id AND l.id = w.lexicon_id;
+
+CREATE INDEX linguatec_lexicon_word_etimol_vector ON linguatec_lexicon_word USING gin (etimol_vector);
+CREATE INDEX linguatec_lexicon_example_search_vector ON linguatec_lexicon_example USING gin (search_vector);
+"""
+
+DROP_SQL = """
+DROP INDEX IF EXISTS linguatec_lexicon_example_search_vector;
+DROP INDEX IF EXISTS linguatec_lexicon_word_etimol_vector;
+DROP TRIGGER IF EXISTS linguatec_lexicon_lexicon_search_config_update ON linguatec_lexicon_lexicon;
+DROP TRIGGER IF EXISTS linguatec_lexicon_example_search_vector_update ON linguatec_lexicon_example;
+DROP TRIGGER IF EXISTS linguatec_lexicon_word_etimol_vector_update ON linguatec_lexicon_word;
+DROP FUNCTION IF EXISTS linguatec_lexicon_lexicon_search_config();
+DROP FUNCTION IF EXISTS linguatec_lexicon_example_search_vector();
+DROP FUNCTION IF EXISTS linguatec_lexicon_word_etimol_vector();
+"""
+
+
+def create_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(CREATE_SQL)
+
+
+def drop_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0028_entry_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='example',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='lexicon',
+            name='search_config',
+            field=models.CharField(default='simple', help_text="PostgreSQL text search configuration (e.g. 'spanish') used to index examples and etymologies.", max_length=32),
+        ),
+        migrations.AddField(
+            model_name='word',
+            name='etimol_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_vectors, drop_search_vectors),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.20 on 2026-10-18 11:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0029_search_vectors'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportRecord',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=255)),
+                ('sha256', models.CharField(max_length=64)),
+                ('imported_at', models.DateTimeField(auto_now=True)),
+                ('lexicon', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_records', to='linguatec_lexicon.lexicon')),
+                ('variation', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='linguatec_lexicon.diatopicvariation')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='importrecord',
+            constraint=models.UniqueConstraint(fields=('lexicon', 'path'), name='unique-import-record'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.20 on 2026-10-18 11:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0030_import_records'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskError',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.CharField(max_length=64)),
+                ('position', models.PositiveIntegerField()),
+                ('word', models.TextField(blank=True, default='')),
+                ('column', models.CharField(blank=True, default='', max_length=64)),
+                ('message', models.TextField()),
+            ],
+            options={
+                'ordering': ['task_id', 'position'],
+                'indexes': [models.Index(fields=['task_id', 'position'], name='task-error-position'), models.Index(fields=['task_id', 'column', 'position'], name='task-error-column')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.20 on 2026-10-18 11:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0031_task_errors'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskProgress',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.CharField(max_length=64, unique=True)),
+                ('phase', models.CharField(choices=[('queued', 'Queued'), ('validating', 'Validating'), ('writing', 'Writing'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=16)),
+                ('rows', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(blank=True, null=True)),
+                ('errors', models.PositiveIntegerField(default=0)),
+                ('rate', models.FloatField(default=0, help_text='Rows processed per second on the current phase.')),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.20 on 2026-10-18 12:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('linguatec_lexicon', '0032_task_progress'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['lexicon', 'term', 'id'], name='word-lexicon-term-id'),
+        ),
+    ]
@@ -1,10 +1,21 @@
-from django.contrib.postgres.search import TrigramSimilarity
+import json
+import re
+from contextlib import contextmanager
+
+from asgiref.local import Local
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.contrib.postgres.lookups import TrigramSimilar
+from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                            SearchVectorField, TrigramDistance,
+                                            TrigramSimilarity)
 from django.core.exceptions import ValidationError
-from django.db import connection, models
-from django.db.models import Q
+from django.db import connection, connections, models, transaction
+from django.db.models import (Exists, F, FloatField, OuterRef, Prefetch, Q,
+                              Subquery, prefetch_related_objects)
 from django.db.models import Value as V
-from django.db.models.functions import MD5, Concat
+from django.db.models.functions import MD5, Coalesce, Concat, Greatest
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.functional import cached_property
 from django.utils.text import slugify
 
@@ -21,7 +32,81 @@ def annotate_words_slug(lexicon):
     )
 
 
-class LexiconManager(models.Manager):
+class LexiconRegistry:
+    """
+    In-memory registry of the lexicons indexed by slug to avoid loading
+    the lexicons to resolve the lexicon of (almost) every API request.
+
+    The registry is revalidated with a cheap query of the lexicons data
+    version, so changes made by other processes (or rolled back) are
+    noticed without depending on a shared cache. It's revalidated once
+    per request and on every access outside requests (see signals
+    module). Saving a lexicon bumps its data version.
+    """
+
+    def __init__(self):
+        # (versions, lexicons) replaced at once so concurrent threads
+        # never see lexicons not matching the versions
+        self._registry = (None, None)
+        self._local = Local()
+
+    def get(self, slug):
+        try:
+            return self.lexicons[slug]
+        except KeyError:
+            raise Lexicon.DoesNotExist("Lexicon matching slug '{}' does not exist.".format(slug))
+
+    def all(self):
+        return set(self.lexicons.values())
+
+    @property
+    def lexicons(self):
+        cached_versions, lexicons = self._registry
+        if lexicons is not None and getattr(self._local, 'validated', False):
+            return lexicons
+
+        versions = set(Lexicon.objects.values_list('pk', 'data_version'))
+        if lexicons is None or versions != cached_versions:
+            lexicons = {}
+            versions = set()
+            for lexicon in Lexicon.objects.all():
+                lexicons[lexicon.slug] = lexicon
+                # allow retrieving lexicon by its not slugified topic
+                lexicons[lexicon.raw_slug] = lexicon
+                versions.add((lexicon.pk, lexicon.data_version))
+            self._registry = (versions, lexicons)
+
+        self._local.validated = getattr(self._local, 'in_request', False)
+        return lexicons
+
+    def request_started(self):
+        self._local.in_request = True
+        self._local.validated = False
+
+    def request_finished(self):
+        self._local.in_request = False
+        self._local.validated = False
+
+    def expire(self):
+        """Revalidate the registry on next access (e.g. lexicon changed)."""
+        self._local.validated = False
+
+
+lexicon_registry = LexiconRegistry()
+
+
+class LexiconQuerySet(models.QuerySet):
+    def bump_data_version(self):
+        """
+        Notify that data of the lexicons has changed (e.g. after importing
+        data or editing it using the admin).
+        """
+        updated = self.update(data_version=F('data_version') + 1, data_updated=timezone.now())
+        lexicon_registry.expire()
+        return updated
+
+
+class LexiconManager(models.Manager.from_queryset(LexiconQuerySet)):
     def get_by_slug(self, slug):
         try:
             code, topic = slug.split("@")
@@ -29,9 +114,12 @@ class LexiconManager(models.Manager):
             code = slug
             topic = ''
 
-        src, dst = utils.get_lexicon_languages_from_code(code)
+        # raise ValueError if code is not valid
+        utils.get_lexicon_languages_from_code(code)
 
-        return self.get(src_language=src, dst_language=dst, topic=topic)
+        if not topic:
+            return lexicon_registry.get(code)
+        return lexicon_registry.get(f"{code}@{topic}")
 
 
 class Lexicon(models.Model):
@@ -54,6 +142,18 @@ class Lexicon(models.Model):
     src_language = models.CharField(max_length=2)
     dst_language = models.CharField(max_length=2)
     topic = models.CharField(max_length=32, blank=True, help_text="The subject of the lexicon.")
+    search_config = models.CharField(
+        max_length=32, default='simple',
+        help_text="PostgreSQL text search configuration (e.g. 'spanish') used to index examples and etymologies.",
+    )
+    data_version = models.PositiveIntegerField(
+        default=1, editable=False,
+        help_text="Incremented every time the data of the lexicon changes.",
+    )
+    data_updated = models.DateTimeField(
+        default=timezone.now, editable=False,
+        help_text="Last time the data of the lexicon changed.",
+    )
 
     objects = LexiconManager()
 
@@ -66,7 +166,7 @@ class Lexicon(models.Model):
     def code(self):
         return (self.src_language + '-' + self.dst_language)
 
-    @property
+    @cached_property
     def slug(self):
         if not self.topic:
             return self.code
@@ -74,19 +174,133 @@ class Lexicon(models.Model):
         topic = slugify(self.topic)
         return f"{self.src_language}-{self.dst_language}@{topic}"
 
+    @property
+    def raw_slug(self):
+        if not self.topic:
+            return self.code
+
+        return f"{self.code}@{self.topic}"
+
     def __str__(self):
         return self.name
 
+    def clean(self):
+        try:
+            validators.validate_search_config(self.search_config)
+        except ValidationError as e:
+            raise ValidationError({'search_config': e})
+
+    def bump_data_version(self):
+        Lexicon.objects.filter(pk=self.pk).bump_data_version()
+        self.refresh_from_db(fields=['data_version', 'data_updated'])
+
     def get_reverse_pair(self):
         """
         Retrieve reverse lexicon of language pair
         e.g. if current lexicon was Spanish-Aragonese returns Aragonese-Spanish
         """
-        return Lexicon.objects.get(dst_language=self.src_language, src_language=self.dst_language, topic=self.topic)
+        reverse_code = f"{self.dst_language}-{self.src_language}"
+        if not self.topic:
+            return Lexicon.objects.get_by_slug(reverse_code)
+        return Lexicon.objects.get_by_slug(f"{reverse_code}@{self.topic}")
+
+
+def entries_prefetch():
+    entries = Entry.objects.select_related(
+        'variation__region', 'conjugation',
+    ).prefetch_related(
+        'gramcats', 'labels', 'examples',
+    ).order_by(*Entry._meta.ordering)
+    return Prefetch('entries', queryset=entries)
 
 
-class WordManager(models.Manager):
-    TERM_PUNCTUATION_SIGNS = '¡!¿?'
+def prefetch_words_entries(words):
+    """Same as WordQuerySet.prefetch_entries for already retrieved words."""
+    prefetch_related_objects(words, 'lexicon', entries_prefetch())
+
+
+class WordQuerySet(models.QuerySet):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._similarity_threshold = None
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._similarity_threshold = self._similarity_threshold
+        return clone
+
+    def with_similarity_threshold(self, value):
+        """
+        Define the threshold used by the trigram operator `%` (by default
+        0.3) while the queryset is evaluated. It's set locally on the
+        transaction which runs the query so it doesn't leak to other
+        queries of the (maybe pooled) database connection.
+        """
+        clone = self._chain()
+        clone._similarity_threshold = value
+        return clone
+
+    @contextmanager
+    def _similarity_threshold_scope(self):
+        if self._similarity_threshold is None:
+            yield
+            return
+
+        # SET LOCAL lasts until the end of the (maybe outer) transaction
+        with transaction.atomic(using=self.db, savepoint=False):
+            with connections[self.db].cursor() as cursor:
+                cursor.execute("SELECT set_config('pg_trgm.similarity_threshold', %s, true)",
+                               [str(self._similarity_threshold)])
+            yield
+
+    def _fetch_all(self):
+        if self._result_cache is not None:
+            return
+        with self._similarity_threshold_scope():
+            super()._fetch_all()
+
+    def count(self):
+        if self._result_cache is not None:
+            return len(self._result_cache)
+        with self._similarity_threshold_scope():
+            return super().count()
+
+    def exists(self):
+        if self._result_cache is not None:
+            return bool(self._result_cache)
+        with self._similarity_threshold_scope():
+            return super().exists()
+
+    def iterator(self, *args, **kwargs):
+        with self._similarity_threshold_scope():
+            yield from super().iterator(*args, **kwargs)
+
+    def prefetch_entries(self):
+        """
+        Retrieve all the data required to serialize the words (see
+        WordSerializer) using a fixed number of queries.
+        """
+        return self.select_related('lexicon').prefetch_related(entries_prefetch())
+
+    def with_gramcats(self):
+        """
+        Retrieve the gramatical categories of the words (see Word.gramcats)
+        without running a query per word.
+        """
+        if connection.vendor == 'postgresql':
+            return self.annotate(
+                gramcats_abbrs=ArrayAgg(
+                    'entries__gramcats__abbreviation', distinct=True,
+                    filter=Q(entries__gramcats__isnull=False), default=V([]),
+                ),
+            )
+
+        entries = Entry.objects.prefetch_related('gramcats')
+        return self.prefetch_related(Prefetch('entries', queryset=entries))
+
+
+class WordManager(models.Manager.from_queryset(WordQuerySet)):
+    TERM_PUNCTUATION_SIGNS = utils.TERM_PUNCTUATION_SIGNS
 
     def _clean_search_query(self, query):
         """Handle characters which breaks or generate issues with regex expression."""
@@ -100,8 +314,19 @@ class WordManager(models.Manager):
 
         return query
 
+    def _normalized_filter(self, query):
+        """
+        Accent and case insensitive match of the query or expressions
+        starting with it (resolved using normalized_term index).
+        """
+        normalized = utils.normalize_term(query or '')
+        if not normalized:
+            return Q(pk__in=[])
+        return Q(normalized_term=normalized) | Q(normalized_term__startswith=normalized + ' ')
+
     def search(self, query, lex=None):
         MIN_SIMILARITY = 0.3
+        normalized_filter = self._normalized_filter(query)
         query = self._clean_search_query(query)
         qs = self._filter_by_lexicon(lex)
 
@@ -109,7 +334,7 @@ class WordManager(models.Manager):
             iregex = r"\y{0}\y"
         elif connection.vendor == 'sqlite':
             iregex = r"\b{0}\b"
-            return qs.filter(term__iregex=iregex.format(query))
+            return qs.filter(Q(term__iregex=iregex.format(query)) | normalized_filter)
         else:
             filter_query = (
                 Q(term=query) |
@@ -118,13 +343,82 @@ class WordManager(models.Manager):
             )
             return qs.filter(filter_query)
 
-        # sort results by trigram similarity
-        qs = qs.filter(
-            term__iregex=iregex.format(query)
-        ).annotate(similarity=TrigramSimilarity('term', query)
-                   ).filter(similarity__gt=MIN_SIMILARITY).order_by('-similarity')
+        if query is None:
+            return qs.none()
+
+        # `term % query` can be resolved using the trigram index (see
+        # migration 0020) while `similarity > x` requires a sequential scan
+        # (only used to recheck the rows found because `%` means `>=`).
+        # MIN_SIMILARITY is the default threshold of `%` so it isn't set
+        # (see with_similarity_threshold). Results are sorted by trigram similarity.
+        qs = qs.annotate(
+            similarity=TrigramSimilarity('term', query),
+        ).filter(
+            normalized_filter | Q(
+                TrigramSimilar(F('term'), query),
+                similarity__gt=MIN_SIMILARITY,
+                term__iregex=iregex.format(query),
+            ),
+        ).order_by('-similarity')
         return qs
 
+    def search_translation(self, query, lex=None):
+        """
+        Reverse search: words with a translation that contains the words
+        of the query (e.g. which Spanish words are translated as 'casa').
+        """
+        qs = self._filter_by_lexicon(lex)
+        query = (query or '').strip()
+        if not query:
+            return qs.none()
+
+        entries = Entry.objects.filter(word=OuterRef('pk'))
+        if connection.vendor == 'postgresql':
+            # full-text search resolved using GIN index (see migration 0028)
+            entries = entries.filter(search_vector=SearchQuery(query, config='simple'))
+        else:
+            for token in query.split():
+                entries = entries.filter(translation__iregex=r"\b{}\b".format(re.escape(token)))
+
+        return qs.filter(Exists(entries)).order_by('term')
+
+    def search_corpus(self, query, lex):
+        """
+        Words with an etymology or examples containing the words of the
+        query, sorted by relevance.
+        """
+        qs = self._filter_by_lexicon(lex)
+        query = (query or '').strip()
+        if not query:
+            return qs.none()
+
+        examples = Example.objects.filter(entry__word=OuterRef('pk'))
+        if connection.vendor != 'postgresql':
+            return qs.filter(
+                Q(etimol__icontains=query) | Exists(examples.filter(phrase__icontains=query))
+            ).order_by('term')
+
+        # documents are indexed using the configuration of their lexicon
+        # (see migration 0029) so query should use the same one
+        try:
+            lexicon = Lexicon.objects.get_by_slug(lex)
+        except Lexicon.DoesNotExist:
+            return qs.none()
+        search_query = SearchQuery(query, config=lexicon.search_config)
+        examples = examples.filter(search_vector=search_query)
+        examples_rank = examples.annotate(
+            rank=SearchRank(F('search_vector'), search_query),
+        ).order_by('-rank').values('rank')[:1]
+
+        return qs.filter(
+            Q(etimol_vector=search_query) | Exists(examples)
+        ).annotate(
+            rank=Greatest(
+                Coalesce(SearchRank(F('etimol_vector'), search_query), V(0.0), output_field=FloatField()),
+                Coalesce(Subquery(examples_rank), V(0.0), output_field=FloatField()),
+            ),
+        ).order_by('-rank', 'term')
+
     def search_near(self, query, lex=None):
         # https://docs.djangoproject.com/en/2.1/ref/contrib/postgres/search/#trigram-similarity
         # https://www.postgresql.org/docs/current/pgtrgm.html
@@ -133,9 +427,19 @@ class WordManager(models.Manager):
         MIN_SIMILARITY = 0.2
 
         qs = self._filter_by_lexicon(lex)
+        if query is None:
+            return qs.none()
+
+        # sort by distance (1 - similarity) because `term <-> query` can be
+        # resolved by walking the GiST index (see migration 0021), so slicing
+        # the queryset (top-k) doesn't require sorting the whole lexicon.
         qs = qs.annotate(
             similarity=TrigramSimilarity('term', query),
-        ).filter(similarity__gt=MIN_SIMILARITY).order_by('-similarity')
+            distance=TrigramDistance('term', query),
+        ).filter(
+            TrigramSimilar(F('term'), query),
+            similarity__gt=MIN_SIMILARITY,
+        ).order_by('distance').with_similarity_threshold(MIN_SIMILARITY)
 
         return qs
 
@@ -160,13 +464,25 @@ class Word(models.Model):
     """
     lexicon = models.ForeignKey('Lexicon', on_delete=models.CASCADE, related_name="words")
     term = models.CharField(max_length=64)
+    normalized_term = models.CharField(max_length=64, blank=True, editable=False,
+                                       help_text="Search key (see utils.normalize_term).")
     slug = models.SlugField()
     etimol = models.CharField(max_length=255, blank=True)
+    # NOTE: updated by a PostgreSQL trigger (see migration 0029)
+    etimol_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=['lexicon', 'term'], name='lexicon-term')
         ]
+        indexes = [
+            # keyset pagination of all the words or of a lexicon (see WordCursorPagination)
+            models.Index(fields=['term', 'id'], name='word-term-id'),
+            models.Index(fields=['lexicon', 'term', 'id'], name='word-lexicon-term-id'),
+            # exact and prefix search (pattern ops allow LIKE 'foo%' on PostgreSQL)
+            models.Index(fields=['lexicon', 'normalized_term'], name='word-lexicon-normalized-term',
+                         opclasses=['int4_ops', 'varchar_pattern_ops']),
+        ]
 
     objects = WordManager()
 
@@ -174,7 +490,19 @@ class Word(models.Model):
         return self.term
 
     def gramcats(self):
-        return set(self.entries.values_list('gramcats__abbreviation', flat=True))
+        if hasattr(self, 'gramcats_abbrs'):
+            # annotated by WordQuerySet.with_gramcats
+            return set(self.gramcats_abbrs)
+
+        if 'entries' in getattr(self, '_prefetched_objects_cache', {}):
+            # avoid an extra query when entries have been prefetched
+            gramcats = set()
+            for entry in self.entries.all():
+                gramcats.update(gramcat.abbreviation for gramcat in entry.gramcats.all())
+            return gramcats
+
+        entries = self.entries.filter(gramcats__isnull=False)
+        return set(entries.values_list('gramcats__abbreviation', flat=True))
 
     @property
     def admin_panel_url(self):
@@ -182,8 +510,9 @@ class Word(models.Model):
 
     def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
         self.slug = self.calculate_slug()
+        self.normalized_term = utils.normalize_term(self.term)
         if update_fields is not None and "term" in update_fields:
-            update_fields = {"slug"}.union(update_fields)
+            update_fields = {"slug", "normalized_term"}.union(update_fields)
         super().save(
             force_insert=force_insert,
             force_update=force_update,
@@ -211,6 +540,21 @@ class DiatopicVariation(models.Model):
         return "{} ({})".format(self.name, self.region)
 
 
+class WordDocument(models.Model):
+    """
+    Precomputed representation of a Word as returned by the API (see
+    documents module). It is only valid while `data_version` matches
+    the data version of the lexicon of the word.
+
+    """
+    word = models.OneToOneField('Word', on_delete=models.CASCADE, primary_key=True, related_name='document')
+    data_version = models.PositiveIntegerField()
+    content = models.TextField('Serialized word (JSON).')
+
+    def __str__(self):
+        return "{} (v{})".format(self.word_id, self.data_version)
+
+
 class Entry(models.Model):
     """
     The Entry class represents each translation (written in the
@@ -222,6 +566,8 @@ class Entry(models.Model):
     variation = models.ForeignKey('DiatopicVariation', null=True, on_delete=models.CASCADE, related_name="entries")
     translation = models.TextField()
     marked_translation = models.TextField(default='', blank=True)
+    # NOTE: updated by a PostgreSQL trigger (see migration 0028)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         # TODO instead of depend on 'pk' find another method to
@@ -245,6 +591,8 @@ class Example(models.Model):
     """
     entry = models.ForeignKey('Entry', on_delete=models.CASCADE, related_name="examples")
     phrase = models.TextField()
+    # NOTE: updated by a PostgreSQL trigger (see migration 0029)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self):
         return self.phrase
@@ -261,12 +609,82 @@ class GramaticalCategory(models.Model):
         return self.abbreviation
 
 
+class VerbalConjugationQuerySet(models.QuerySet):
+    def refresh_model_word_refs(self, words):
+        """
+        Resolve the model word of the conjugations which don't reference it
+        (e.g. the model verb has been imported after the conjugation or it
+        has been deleted and imported again). `words` is a mapping
+        {term: pk} of the words of the lexicon. Return the number of
+        conjugations updated.
+        """
+        conjugations = []
+        qs = self.filter(model_word_ref__isnull=True, parsed__contains='"model_word"')
+        for conjugation in qs.only('pk', 'parsed'):
+            conjugation.model_word_ref_id = words.get(conjugation.model_word, None)
+            if conjugation.model_word_ref_id is not None:
+                conjugations.append(conjugation)
+
+        return self.bulk_update(conjugations, ['model_word_ref'], batch_size=1000)
+
+
 class VerbalConjugation(models.Model):
     KEYWORD_MODEL = "modelo. conjug."
     KEYWORD_CONJUGATION = "conjug."
 
     entry = models.OneToOneField('Entry', on_delete=models.CASCADE, related_name="conjugation")
     raw = models.TextField('Raw imported content.')
+    # NOTE: parsed content is stored as JSON text instead of JSONField
+    # because PostgreSQL jsonb doesn't keep the order of the keys (moods
+    # and tenses of the conjugation should be kept in order).
+    parsed = models.TextField('Parsed content (JSON).', blank=True, default='', editable=False)
+    model_word_ref = models.ForeignKey(
+        'Word', null=True, blank=True, editable=False, on_delete=models.SET_NULL, related_name='+',
+        help_text="Word used as conjugation model (resolved from parsed content).",
+    )
+
+    objects = VerbalConjugationQuerySet.as_manager()
+
+    def clean(self):
+        # raise ValidationError if raw content cannot be parsed
+        self.refresh_parsed()
+
+    def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
+        try:
+            self.refresh_parsed()
+        except ValidationError:
+            # keep content unparsed (e.g. imported using `allow_partial`)
+            self.parsed = ''
+            self.model_word_ref_id = None
+        if update_fields is not None and "raw" in update_fields:
+            update_fields = {"parsed", "model_word_ref"}.union(update_fields)
+        super().save(
+            force_insert=force_insert,
+            force_update=force_update,
+            using=using,
+            update_fields=update_fields,
+        )
+
+    def refresh_parsed(self, words=None):
+        """
+        Parse raw content and store the result (avoid parsing it on every
+        request). `words` is an optional mapping {term: pk} of the words of
+        the lexicon used to resolve the model word without querying the DB.
+        """
+        self.__dict__.pop('parse_raw', None)
+        self.__dict__.pop('parsed_data', None)
+        parsed = self.parse_raw
+        self.parsed = json.dumps(parsed)
+
+        model_word = parsed.get('model_word', None)
+        if model_word is None:
+            self.model_word_ref_id = None
+        elif words is not None:
+            self.model_word_ref_id = words.get(model_word, None)
+        else:
+            self.model_word_ref_id = Word.objects.filter(
+                term=model_word, lexicon__words__entries=self.entry_id,
+            ).values_list('pk', flat=True).first()
 
     @cached_property
     def parse_raw(self):
@@ -293,26 +711,38 @@ class VerbalConjugation(models.Model):
 
         return parsed
 
+    @cached_property
+    def parsed_data(self):
+        # fallback to parse raw content when it hasn't been stored yet
+        # (e.g. data imported before `parsed` field was added)
+        if not self.parsed:
+            return self.parse_raw
+        return json.loads(self.parsed)
+
     @property
     def intro(self):
-        return self.parse_raw.get('intro', None)
+        return self.parsed_data.get('intro', None)
 
     @property
     def conjugation(self):
-        return self.parse_raw.get('conjugation', None)
+        return self.parsed_data.get('conjugation', None)
 
     @property
     def model(self):
-        return self.parse_raw.get('model', None)
+        return self.parsed_data.get('model', None)
 
     @property
     def model_word(self):
-        return self.parse_raw.get('model_word', None)
+        return self.parsed_data.get('model_word', None)
 
     @property
     def model_word_id(self):
         if self.model_word is None:
             return None
+
+        if self.parsed:
+            return self.model_word_ref_id
+
         try:
             return Word.objects.get(term=self.model_word, lexicon=self.entry.word.lexicon).pk
         except Word.DoesNotExist:
@@ -332,3 +762,90 @@ class Label(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class ImportRecord(models.Model):
+    """
+    Files imported using importmanifest command. The hash of the content
+    allows skipping files which haven't changed since their last import.
+
+    """
+    lexicon = models.ForeignKey('Lexicon', on_delete=models.CASCADE, related_name="import_records")
+    variation = models.ForeignKey('DiatopicVariation', null=True, on_delete=models.CASCADE, related_name="+")
+    path = models.CharField(max_length=255)
+    sha256 = models.CharField(max_length=64)
+    imported_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['lexicon', 'path'], name='unique-import-record')
+        ]
+
+    def __str__(self):
+        return self.path
+
+
+class TaskError(models.Model):
+    """
+    Error found by a validation task (see tasks module). Errors are stored
+    while the task is running so they can be paginated, filtered and
+    counted by the database.
+
+    """
+    task_id = models.CharField(max_length=64)
+    position = models.PositiveIntegerField()
+    word = models.TextField(blank=True, default='')
+    column = models.CharField(max_length=64, blank=True, default='')
+    message = models.TextField()
+
+    class Meta:
+        ordering = ['task_id', 'position']
+        indexes = [
+            models.Index(fields=['task_id', 'position'], name='task-error-position'),
+            models.Index(fields=['task_id', 'column', 'position'], name='task-error-column'),
+        ]
+
+    def __str__(self):
+        return self.message
+
+
+class TaskProgress(models.Model):
+    """
+    Progress of a validation task reported by the import command while
+    it's running (see tasks.TaskProgressReporter).
+
+    """
+    QUEUED = 'queued'
+    VALIDATING = 'validating'
+    WRITING = 'writing'
+    DONE = 'done'
+    FAILED = 'failed'
+    PHASE_CHOICES = (
+        (QUEUED, 'Queued'),
+        (VALIDATING, 'Validating'),
+        (WRITING, 'Writing'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    )
+
+    task_id = models.CharField(max_length=64, unique=True)
+    phase = models.CharField(max_length=16, choices=PHASE_CHOICES, default=QUEUED)
+    rows = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(null=True, blank=True)
+    errors = models.PositiveIntegerField(default=0)
+    rate = models.FloatField(default=0, help_text="Rows processed per second on the current phase.")
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return "{} ({})".format(self.task_id, self.phase)
+
+    @property
+    def finished(self):
+        return self.phase in (self.DONE, self.FAILED)
+
+    @property
+    def percent(self):
+        if not self.total:
+            return None
+        return min(100, int(100 * self.rows / self.total))
@@ -0,0 +1,75 @@
+"""
+Progress reporting of import commands.
+
+Commands accept a `progress` reporter (stealth option, only available
+calling them with call_command) and notify it when a phase starts and
+every time a row is processed. The base reporter just logs the
+throughput of every phase; `tasks.TaskProgressReporter` also stores the
+progress and the errors found so far of validation tasks.
+
+"""
+import logging
+import time
+
+from linguatec_lexicon.models import TaskProgress
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    # minimum seconds between two calls to save()
+    interval = 1.0
+
+    def __init__(self, name='', interval=None):
+        self.name = name
+        if interval is not None:
+            self.interval = interval
+        self.phase = TaskProgress.QUEUED
+        self.rows = 0
+        self.total = None
+        self.errors_count = 0
+        self.phase_started = self.saved_at = time.monotonic()
+
+    @property
+    def rate(self):
+        """Rows processed per second on the current phase."""
+        elapsed = time.monotonic() - self.phase_started
+        return self.rows / elapsed if elapsed > 0 else 0
+
+    def start(self, phase, total=None):
+        self.log_phase()
+        self.phase = phase
+        self.rows = 0
+        self.total = total
+        self.phase_started = time.monotonic()
+        self.save()
+
+    def update(self, rows, errors=None):
+        """
+        Set the number of rows processed on the current phase. `errors` is
+        the list of errors found so far: only the new ones are reported.
+        """
+        self.rows = rows
+        if errors is not None and len(errors) > self.errors_count:
+            self.add_errors(errors[self.errors_count:])
+            self.errors_count = len(errors)
+
+        if time.monotonic() - self.saved_at >= self.interval:
+            self.save()
+
+    def finish(self, phase=TaskProgress.DONE):
+        self.log_phase()
+        self.phase = phase
+        self.save()
+
+    def log_phase(self):
+        if self.phase == TaskProgress.QUEUED:
+            return
+        logger.info("%s %s: %d rows in %.2fs (%.1f rows/s), %d errors", self.name, self.phase, self.rows,
+                    time.monotonic() - self.phase_started, self.rate, self.errors_count)
+
+    def add_errors(self, errors):
+        pass
+
+    def save(self):
+        self.saved_at = time.monotonic()
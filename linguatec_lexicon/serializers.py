@@ -55,8 +55,9 @@ class WordSerializer(serializers.ModelSerializer):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        user = self.context['request'].user
-        if not (user.is_authenticated and user.is_staff):
+        # NOTE: request is None when building word documents (see documents module)
+        user = getattr(self.context['request'], 'user', None)
+        if not (user and user.is_authenticated and user.is_staff):
             self.fields.pop('admin_panel_url')
 
 
@@ -69,4 +70,5 @@ class WordNearSerializer(serializers.ModelSerializer):
 class LexiconSerializer(serializers.ModelSerializer):
     class Meta:
         model = Lexicon
-        fields = ('id', 'code', 'name', 'src_language', 'dst_language', 'topic', 'slug')
+        fields = ('id', 'code', 'name', 'src_language', 'dst_language', 'topic', 'slug',
+                  'data_version')
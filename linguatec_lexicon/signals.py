@@ -0,0 +1,28 @@
+from django.core.signals import request_finished, request_started
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from linguatec_lexicon.models import Lexicon, lexicon_registry
+
+
+@receiver(post_save, sender=Lexicon)
+def bump_lexicon_data_version(sender, instance, created, raw, **kwargs):
+    # notify the lexicon registry (and API clients) that the lexicon changed
+    if not created and not raw:
+        instance.bump_data_version()
+
+
+@receiver(post_save, sender=Lexicon)
+@receiver(post_delete, sender=Lexicon)
+def expire_lexicon_registry(sender, **kwargs):
+    lexicon_registry.expire()
+
+
+@receiver(request_started)
+def validate_lexicon_registry_once(sender, **kwargs):
+    lexicon_registry.request_started()
+
+
+@receiver(request_finished)
+def validate_lexicon_registry_always(sender, **kwargs):
+    lexicon_registry.request_finished()
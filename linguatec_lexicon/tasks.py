@@ -1,14 +1,119 @@
 # from django_q.tasks import async_task
 
 # async_task("dgames.tasks.notify_new_reward_to_make", reward.id)
+from datetime import timedelta
 from io import StringIO
 
+from django.conf import settings
 from django.core.management import call_command
+from django.utils import timezone
 
-from linguatec_lexicon.models import Lexicon
+from linguatec_lexicon import uploads
+from linguatec_lexicon.models import TaskError, TaskProgress
+from linguatec_lexicon.progress import ProgressReporter
 
 
-def validate_mono(lexicon_slug, xlsx_file):
-    out = StringIO()
-    call_command('importmono', lexicon_slug, xlsx_file, no_color=True, verbosity=3, stdout=out, stderr=out)
-    return out
+class TaskErrorWriter:
+    """
+    Store the errors found by a task as TaskError (bulk created in
+    batches). Errors are dicts with word, column and message keys like the
+    ones written by the import commands.
+    """
+
+    def __init__(self, task_id, batch_size=500):
+        self.task_id = task_id
+        self.batch_size = batch_size
+        self.pending = []
+        self.count = 0
+
+    def add(self, error):
+        message = error.get('message', '')
+        if isinstance(message, list):
+            message = '; '.join(str(value) for value in message)
+
+        self.count += 1
+        self.pending.append(TaskError(
+            task_id=self.task_id,
+            position=self.count,
+            word=str(error.get('word', '')),
+            column=str(error.get('column', '')),
+            message=str(message),
+        ))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        TaskError.objects.bulk_create(self.pending)
+        self.pending = []
+
+
+class TaskProgressReporter(ProgressReporter):
+    """
+    Store the progress of the task as TaskProgress and the errors found
+    so far as TaskError, so they can be shown while the task is running.
+    """
+
+    def __init__(self, task_id, interval=None):
+        super().__init__(task_id, interval)
+        self.task_id = task_id
+        self.errors = TaskErrorWriter(task_id)
+
+    def add_errors(self, errors):
+        for error in errors:
+            self.errors.add(error)
+
+    def save(self):
+        super().save()
+        self.errors.flush()
+        TaskProgress.objects.update_or_create(task_id=self.task_id, defaults={
+            'phase': self.phase,
+            'rows': self.rows,
+            'total': self.total,
+            'errors': self.errors_count,
+            'rate': self.rate,
+        })
+
+
+def remove_stale_results(max_age=None):
+    """
+    Remove the progress and the errors of the tasks not updated during
+    the last LINGUATEC_TASK_RESULTS_MAX_AGE seconds (7 days by default).
+    """
+    if max_age is None:
+        max_age = getattr(settings, 'LINGUATEC_TASK_RESULTS_MAX_AGE', 7 * 24 * 60 * 60)
+
+    stale = TaskProgress.objects.filter(updated_at__lt=timezone.now() - timedelta(seconds=max_age))
+    TaskError.objects.filter(task_id__in=stale.values('task_id')).delete()
+    stale.delete()
+
+
+def run_validation(command, lexicon_slug, xlsx_file, task_id, **options):
+    """
+    Run the import command reporting its progress and the errors found
+    (see TaskProgressReporter) and return the number of errors. The input
+    file (see uploads module) is removed afterwards.
+    """
+    progress = TaskProgressReporter(task_id)
+    try:
+        call_command(command, lexicon_slug, xlsx_file, no_color=True, stdout=StringIO(), stderr=StringIO(),
+                     progress=progress, **options)
+    except Exception:
+        progress.finish(TaskProgress.FAILED)
+        raise
+    else:
+        progress.finish()
+    finally:
+        uploads.remove_upload(xlsx_file)
+    return progress.errors_count
+
+
+def validate_data(lexicon_slug, xlsx_file, task_id):
+    return run_validation('importdata', lexicon_slug, xlsx_file, task_id, dry_run=True)
+
+
+def validate_variation(lexicon_slug, xlsx_file, task_id):
+    return run_validation('importvariation', lexicon_slug, xlsx_file, task_id, dry_run=True)
+
+
+def validate_mono(lexicon_slug, xlsx_file, task_id):
+    return run_validation('importmono', lexicon_slug, xlsx_file, task_id)
@@ -0,0 +1,77 @@
+"""
+Storage of the files uploaded to the validators until a task worker
+processes them.
+
+Every upload is streamed (chunk by chunk) to its own directory inside
+LINGUATEC_UPLOAD_DIR so the files created by the commands next to the
+input file (e.g. ODS conversion of importmono) are removed with it.
+Directories left behind (e.g. tasks never run) are removed after
+LINGUATEC_UPLOAD_MAX_AGE seconds.
+
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+
+from django.conf import settings
+
+UPLOAD_FILENAME = 'input.xlsx'
+
+
+def get_upload_dir():
+    path = getattr(settings, 'LINGUATEC_UPLOAD_DIR', None)
+    if path is None:
+        path = os.path.join(tempfile.gettempdir(), 'linguatec-uploads')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def get_upload_max_size():
+    return getattr(settings, 'LINGUATEC_UPLOAD_MAX_SIZE', 50 * 1024 * 1024)
+
+
+def store_upload(uploaded_file):
+    """
+    Write the uploaded file chunk by chunk on a new directory of the
+    upload dir computing its SHA-256 meanwhile. Return (path, sha256).
+    """
+    remove_stale_uploads()
+
+    path = os.path.join(tempfile.mkdtemp(dir=get_upload_dir()), UPLOAD_FILENAME)
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'wb') as f:
+            for chunk in uploaded_file.chunks():
+                digest.update(chunk)
+                f.write(chunk)
+    except OSError:
+        remove_upload(path)
+        raise
+
+    return path, digest.hexdigest()
+
+
+def remove_upload(path):
+    """Remove the file and, if it was stored by store_upload, its directory."""
+    directory = os.path.dirname(os.path.abspath(path))
+    if os.path.dirname(directory) == os.path.abspath(get_upload_dir()):
+        shutil.rmtree(directory, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def remove_stale_uploads(max_age=None):
+    if max_age is None:
+        max_age = getattr(settings, 'LINGUATEC_UPLOAD_MAX_AGE', 24 * 60 * 60)
+
+    upload_dir = get_upload_dir()
+    limit = time.time() - max_age
+    for entry in os.scandir(upload_dir):
+        try:
+            if entry.is_dir() and entry.stat().st_mtime < limit:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        except FileNotFoundError:
+            # removed meanwhile by another process
+            continue
@@ -16,4 +16,5 @@ urlpatterns = [
     path('validator-diatopic-variation/', views.DiatopicVariationValidatorView.as_view(), name='validator-variation'),
     path('validator-mono/', views.MonoValidatorView.as_view(), name='validator-mono'),
     path('tasks/<str:task_id>/', views.TaskDetailView.as_view(), name='task-detail'),
+    path('tasks/<str:task_id>/progress/', views.TaskProgressView.as_view(), name='task-progress'),
 ]
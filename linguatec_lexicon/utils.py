@@ -1,5 +1,11 @@
 import hashlib
 import re
+import unicodedata
+
+TERM_PUNCTUATION_SIGNS = '¡!¿?'
+
+# combining characters which are part of a letter (ñ, ç) instead of an accent
+LETTER_MARKS = {'\u0303': 'n', '\u0327': 'c'}
 
 
 def get_lexicon_languages_from_code(lex_code):
@@ -19,3 +25,21 @@ def calculate_slug(lexicon_slug, word_term):
     data = f"{lexicon_slug}|{word_term}"
     encoded_data = data.encode('utf-8')
     return hashlib.md5(encoded_data).hexdigest()
+
+
+def normalize_term(term):
+    """
+    Search key of a term: case-folded, unaccented and without punctuation
+    signs (e.g. '¡Aragón!' is normalized as 'aragon').
+    """
+    term = unicodedata.normalize('NFD', term.casefold())
+    chars = []
+    for char in term:
+        if unicodedata.combining(char) and (not chars or LETTER_MARKS.get(char) != chars[-1]):
+            continue
+        if char in TERM_PUNCTUATION_SIGNS:
+            continue
+        chars.append(char)
+
+    term = unicodedata.normalize('NFC', ''.join(chars))
+    return ' '.join(term.split())
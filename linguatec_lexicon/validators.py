@@ -5,6 +5,7 @@ import string
 
 from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
+from django.db import connection
 from django.utils.deconstruct import deconstructible
 from django.utils.translation import gettext_lazy as _
 
@@ -77,6 +78,23 @@ def validate_lexicon_slug(value):
     return value
 
 
+def validate_search_config(value):
+    """
+    Check that PostgreSQL has a text search configuration named `value`
+    (full-text search is only available on PostgreSQL).
+    """
+    if connection.vendor != 'postgresql':
+        return value
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_ts_config WHERE cfgname = %s", [value])
+        if cursor.fetchone() is None:
+            raise ValidationError(
+                _("'%(value)s' is not a text search configuration."), params={'value': value},
+            )
+    return value
+
+
 def validate_verb_reference_to_model(value):
     from linguatec_lexicon.models import VerbalConjugation
     REGEX = r'^(\w+)\s*\((\w+( \w+)?)\)$'
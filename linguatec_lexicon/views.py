@@ -1,95 +1,66 @@
+import functools
+import hashlib
 import json
-import os
-import tempfile
-from io import StringIO
+import uuid
 
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.management import call_command
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
 from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
-from django.http import Http404
+from django.db.models import Count
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
-from django.views.generic.base import TemplateView
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from django.views.generic.base import TemplateView, View
 from django.views.generic.edit import FormView
-from django_q.tasks import async_task, result
+from django_q.tasks import async_task, fetch
 from rest_framework import generics, viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
 from rest_framework.response import Response
 
-from linguatec_lexicon import tasks
+from linguatec_lexicon import documents, get_version, tasks, uploads
 
 from .forms import ValidatorForm
-from .models import GramaticalCategory, Lexicon, Word
+from .models import (GramaticalCategory, Lexicon, TaskError, TaskProgress,
+                     Word, lexicon_registry)
 from .serializers import (GramaticalCategorySerializer, LexiconSerializer,
                           WordNearSerializer, WordSerializer)
+from .utils import normalize_term
 from .validators import validate_lexicon_slug
 
 
-class DataValidatorView(LoginRequiredMixin, TemplateView):
-    template_name = "linguatec_lexicon/datavalidator.html"
-    title = "Data validator"
-
-    def post(self, request, *args, **kwargs):
-        context = self.get_context_data(**kwargs)
-        form = ValidatorForm(request.POST, request.FILES)
-
-        if form.is_valid():
-            xlsx_file = form.cleaned_data['input_file']
-
-            # store uploaded file as a temporal file
-            tmp_fd, tmp_file = tempfile.mkstemp(suffix='.xlsx')
-            f = os.fdopen(tmp_fd, 'wb')  # open the tmp file for writing
-            f.write(xlsx_file.read())  # write the tmp file
-            f.close()
-
-            # validate uploaded file and handle errors (if any)
-            out = self.validate(tmp_file)
-            errors = []
-            for line in out.getvalue().split('\n'):
-                try:
-                    data = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                errors.append(data)
-
-            context.update({
-                'errors': errors,
-                'input_file': xlsx_file,
-            })
-            return self.render_to_response(context)
+def get_validation_cache():
+    alias = getattr(settings, 'LINGUATEC_VALIDATION_CACHE', None)
+    return caches[alias] if alias else None
 
-        context['form'] = form
-        return self.render_to_response(context)
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context.update({
-            'form':  ValidatorForm(),
-            'title': self.title,
-        })
-        return context
-
-    def validate(self, xlsx_file):
-        out = StringIO()
-        # TODO(@slamora) lexicon paramenter is required since multilexicon support is added
-        default_lexicon = 'es-ar'   # TODO XXX XXX
-        call_command('importdata', default_lexicon, xlsx_file, dry_run=True, no_color=True, verbosity=3, stdout=out)
-        return out
-
-
-class DiatopicVariationValidatorView(DataValidatorView):
-    title = "Diatopic variation validator"
+def get_validation_cache_key(validator, lexicon_slug, sha256):
+    """
+    Validation results only depend on the content of the file and on the
+    data of the lexicon (data version is also bumped when gramatical
+    categories change). Return None if the lexicon doesn't exist.
+    """
+    try:
+        lexicon = Lexicon.objects.get_by_slug(lexicon_slug)
+    except (ValueError, Lexicon.DoesNotExist):
+        return None
 
-    def validate(self, xlsx_file):
-        out = StringIO()
-        call_command('importvariation', xlsx_file, dry_run=True, no_color=True, verbosity=3, stdout=out)
-        return out
+    key = [validator, get_version(), lexicon.pk, lexicon.data_version, sha256]
+    return 'linguatec_lexicon:validation:' + hashlib.md5(json.dumps(key).encode()).hexdigest()
 
 
-class MonoValidatorView(LoginRequiredMixin, FormView):
-    title = "Monolingual validator"
-    lexicon = 'an-an'
+class ValidatorView(LoginRequiredMixin, FormView):
+    """
+    Validate the uploaded file running `task` asynchronously (django-q)
+    and redirect to the task detail (which shows the errors found).
+    """
+    title = None
+    lexicon = None
+    task = None
     form_class = ValidatorForm
     template_name = "linguatec_lexicon/datavalidator.html"
 
@@ -101,18 +72,32 @@ class MonoValidatorView(LoginRequiredMixin, FormView):
         return context
 
     def form_valid(self, form):
-        xlsx_file = form.cleaned_data['input_file']
-
-        # store uploaded file as a temporal file
-        tmp_fd, tmp_file = tempfile.mkstemp(suffix='.xlsx')
-        with open(tmp_file, 'wb') as f:
-            f.write(xlsx_file.read())
-
-        # run the validation async
-
-        task_id = async_task(tasks.validate_mono, self.lexicon, tmp_file)
+        # the task worker removes the file once validated
+        path, sha256 = uploads.store_upload(form.cleaned_data['input_file'])
+        tasks.remove_stale_results()
+
+        # reuse the result of a previous validation of the same content
+        cache = get_validation_cache()
+        key = None
+        if cache is not None:
+            key = get_validation_cache_key(type(self).__name__, self.lexicon, sha256)
+            task_id = cache.get(key) if key else None
+            task = fetch(task_id) if task_id else None
+            # its errors may have been removed meanwhile (see remove_stale_results)
+            if task is not None and task.success and TaskProgress.objects.filter(task_id=task_id).exists():
+                uploads.remove_upload(path)
+                self.task_id = task_id
+                return super().form_valid(form)
+
+        # run the validation async: task name identifies the task and its errors
+        task_id = uuid.uuid4().hex
+        TaskProgress.objects.create(task_id=task_id)
+        async_task(self.task, self.lexicon, path, task_id, task_name=task_id)
 
         self.task_id = task_id
+        if key is not None:
+            timeout = getattr(settings, 'LINGUATEC_VALIDATION_CACHE_TIMEOUT', 60 * 60 * 24)
+            cache.set(key, task_id, timeout)
 
         return super().form_valid(form)
 
@@ -120,6 +105,24 @@ class MonoValidatorView(LoginRequiredMixin, FormView):
         return reverse("task-detail", kwargs={"task_id": self.task_id})
 
 
+class DataValidatorView(ValidatorView):
+    title = "Data validator"
+    # TODO(@slamora) lexicon paramenter is required since multilexicon support is added
+    lexicon = 'es-ar'   # TODO XXX XXX
+    task = staticmethod(tasks.validate_data)
+
+
+class DiatopicVariationValidatorView(DataValidatorView):
+    title = "Diatopic variation validator"
+    task = staticmethod(tasks.validate_variation)
+
+
+class MonoValidatorView(ValidatorView):
+    title = "Monolingual validator"
+    lexicon = 'an-an'
+    task = staticmethod(tasks.validate_mono)
+
+
 class TaskDetailView(LoginRequiredMixin, TemplateView):
     template_name = "linguatec_lexicon/task-detail.html"
 
@@ -127,26 +130,29 @@ class TaskDetailView(LoginRequiredMixin, TemplateView):
         context = super().get_context_data(**kwargs)
 
         task_id = kwargs.get('task_id')
-        task_result = result(task_id)
-        data = []
-
-        # NOTE: when the task has not yet be run, r is None
+        # NOTE: when the task has not yet be run, task is None
         # NOTE: we don't have way to differentiate between a task that has not been run and non existing task
-        if task_result is not None:
-            content = task_result.getvalue()
-            for line in content.split('\n'):
-                if line == '':
-                    continue
+        task = fetch(task_id)
 
-                line = json.loads(line)
-                data.append(line)
+        progress = TaskProgress.objects.filter(task_id=task_id).first()
 
-        data = self.paginate_queryset(data)
+        # errors are stored while the task is running (partial results)
+        errors = TaskError.objects.filter(task_id=task_id)
+        columns = errors.order_by('column').values('column').annotate(count=Count('pk'))
+
+        column = self.request.GET.get('column')
+        if column:
+            errors = errors.filter(column=column)
 
         context.update({
             'task_id': task_id,
-            'task_result': data,
-            'task_finished': task_result is not None,
+            'task_result': self.paginate_queryset(errors.order_by('position')),
+            'task_finished': task is not None,
+            'progress': progress,
+            # failed tasks store the error message as result
+            'task_failure': str(task.result) if task is not None and not task.success else None,
+            'columns': columns,
+            'column': column,
         })
 
         return context
@@ -166,11 +172,175 @@ class TaskDetailView(LoginRequiredMixin, TemplateView):
         return data
 
 
+class TaskProgressView(LoginRequiredMixin, View):
+    """Progress of a task as JSON (polled by task detail while it's running)."""
+
+    def get(self, request, task_id):
+        task = fetch(task_id)
+        progress = TaskProgress.objects.filter(task_id=task_id).first()
+        if task is None and progress is None:
+            raise Http404
+
+        data = {
+            'task_id': task_id,
+            'finished': task is not None,
+            'success': task.success if task is not None else None,
+        }
+        if progress is not None:
+            data.update({
+                'phase': progress.phase,
+                'rows': progress.rows,
+                'total': progress.total,
+                'percent': progress.percent,
+                'errors': progress.errors,
+                'rate': round(progress.rate, 1),
+                'started_at': progress.started_at,
+                'updated_at': progress.updated_at,
+            })
+
+        return JsonResponse(data)
+
+
+def get_request_lexicons(request, *args, **kwargs):
+    """
+    Lexicons whose data is included on the response. By default all
+    of them (e.g. gramatical categories are shared by every lexicon).
+    """
+    return lexicon_registry.all()
+
+
+def get_exact_lexicons(request, *args, **kwargs):
+    try:
+        return {Lexicon.objects.get_by_slug(request.GET.get('l', '').strip())}
+    except (ValueError, Lexicon.DoesNotExist):
+        return set()
+
+
+def get_data_versions(request, lexicons):
+    """
+    Return the sorted (pk, data_version, data_updated) of the lexicons
+    read from the database, so other processes changes are seen. They are
+    read once per request.
+    """
+    pks = tuple(sorted(lexicon.pk for lexicon in lexicons))
+    if not hasattr(request, '_data_versions'):
+        request._data_versions = {}
+    if pks not in request._data_versions:
+        qs = Lexicon.objects.filter(pk__in=pks).order_by('pk')
+        request._data_versions[pks] = list(qs.values_list('pk', 'data_version', 'data_updated'))
+    return request._data_versions[pks]
+
+
+def data_conditions(get_lexicons=get_request_lexicons):
+    """
+    Decorator to handle conditional GET (ETag & Last-Modified) based on
+    lexicons data version, so not modified content is not serialized.
+    """
+    def etag(request, *args, **kwargs):
+        versions = get_data_versions(request, get_lexicons(request, *args, **kwargs))
+        if not versions:
+            return None
+
+        user = request.user
+        key = [
+            get_version(),
+            request.build_absolute_uri(),
+            str(user.is_authenticated and user.is_staff),
+        ]
+        key += ["{}:{}".format(pk, version) for pk, version, _ in versions]
+        return hashlib.md5("|".join(key).encode()).hexdigest()
+
+    def last_modified(request, *args, **kwargs):
+        versions = get_data_versions(request, get_lexicons(request, *args, **kwargs))
+        if not versions:
+            return None
+        return max(updated for _, _, updated in versions)
+
+    return condition(etag_func=etag, last_modified_func=last_modified)
+
+
+def get_response_cache():
+    alias = getattr(settings, 'LINGUATEC_RESPONSE_CACHE', None)
+    return caches[alias] if alias else None
+
+
+def get_response_cache_key(request, name):
+    # normalize parameters so equivalent queries share the same entry
+    params = sorted(
+        (key, ' '.join(value.split()))
+        for key, values in request.query_params.lists() for value in values
+    )
+    # results only change when the data of the lexicon(s) change
+    lexicons = get_exact_lexicons(request) or lexicon_registry.all()
+    versions = [[pk, version] for pk, version, _ in get_data_versions(request, lexicons)]
+    user = request.user
+    key = [
+        name,
+        get_version(),
+        request.build_absolute_uri('/'),
+        user.is_authenticated and user.is_staff,
+        params,
+        versions,
+    ]
+    return 'linguatec_lexicon:response:' + hashlib.md5(json.dumps(key).encode()).hexdigest()
+
+
+def cached_response(func):
+    """
+    Cache the data of the responses of a viewset action (including not
+    found ones) in the cache defined by LINGUATEC_RESPONSE_CACHE setting.
+    """
+    @functools.wraps(func)
+    def wrapper(self, request, *args, **kwargs):
+        cache = get_response_cache()
+        if cache is None:
+            return func(self, request, *args, **kwargs)
+
+        key = get_response_cache_key(request, func.__name__)
+        cached = cache.get(key)
+        if cached is not None:
+            status, data = cached
+            if status == 404:
+                raise Http404()
+            return Response(data, status=status)
+
+        timeout = getattr(settings, 'LINGUATEC_RESPONSE_CACHE_TIMEOUT', 24 * 60 * 60)
+        try:
+            response = func(self, request, *args, **kwargs)
+        except Http404:
+            cache.set(key, (404, None), timeout)
+            raise
+
+        if response.status_code == 200:
+            cache.set(key, (response.status_code, response.data), timeout)
+        return response
+
+    return wrapper
+
+
 class DefaultLimitOffsetPagination(LimitOffsetPagination):
     default_limit = 30
     max_limit = 100
 
 
+class WordCursorPagination(CursorPagination):
+    """
+    Keyset pagination: pages are retrieved filtering by the term of the
+    last word (using an index) instead of skipping `offset` rows and
+    without counting all the rows.
+
+    DRF builds the cursor from the first ordering field only (`term`) and
+    an offset among words sharing that term. `id` just makes the order of
+    those words deterministic.
+    """
+    ordering = ('term', 'id')
+    page_size = DefaultLimitOffsetPagination.default_limit
+    page_size_query_param = 'limit'
+    max_page_size = DefaultLimitOffsetPagination.max_limit
+
+
+@method_decorator(data_conditions(), name='list')
+@method_decorator(data_conditions(), name='retrieve')
 class LexiconViewSet(viewsets.ReadOnlyModelViewSet):
     """
     API endpoint that allows lexicons to be viewed.
@@ -180,22 +350,109 @@ class LexiconViewSet(viewsets.ReadOnlyModelViewSet):
     pagination_class = DefaultLimitOffsetPagination
 
 
-class WordViewSet(viewsets.ReadOnlyModelViewSet):
+class WordDocumentMixin:
+    """
+    Serialize words using precomputed documents when enabled by
+    LINGUATEC_WORD_DOCUMENTS setting (see documents module).
+    """
+
+    def prefetch(self, queryset, many=False):
+        if many and documents.is_enabled(self.request):
+            # related data is only retrieved for words without document
+            return queryset
+        return queryset.prefetch_entries()
+
+    def get_queryset(self):
+        return self.prefetch(super().get_queryset(), many=getattr(self, 'action', None) == 'list')
+
+    def serialize_words(self, words, many=False):
+        if many and documents.is_enabled(self.request):
+            return documents.serialize_words(words, self.get_serializer_context())
+        return self.get_serializer(words, many=many).data
+
+    def list(self, request, *args, **kwargs):
+        return self.list_words(self.filter_queryset(self.get_queryset()))
+
+    def list_words(self, queryset):
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.serialize_words(page, many=True))
+
+        return Response(self.serialize_words(queryset, many=True))
+
+    def retrieve(self, request, *args, **kwargs):
+        if documents.is_enabled(request):
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            lookup = {'word__' + self.lookup_field: kwargs[lookup_url_kwarg]}
+            try:
+                data = documents.get_document(request, **lookup)
+            except (TypeError, ValueError, ValidationError):
+                # invalid lookup value (e.g. not integer pk) as get_object
+                raise Http404
+            if data is not None:
+                return Response(data)
+
+        instance = self.get_object()
+        return Response(self.serialize_words(instance))
+
+
+class WordViewSet(WordDocumentMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint that allows words to be viewed.
     """
-    queryset = Word.objects.all().order_by('term')
+    queryset = Word.objects.order_by('term')
     serializer_class = WordSerializer
     pagination_class = DefaultLimitOffsetPagination
+    cursor_pagination_class = WordCursorPagination
+    batch_max_items = 100
+    batch_fields = {'terms': 'term', 'slugs': 'slug', 'ids': 'pk'}
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            pagination = self.request.query_params.get('pagination')
+            # search results are sorted by relevance, not by term
+            if pagination == 'cursor' and self.action == 'list':
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        lex = self.request.query_params.get('l', '').strip()
+        if self.action == 'list' and lex:
+            try:
+                lexicon = Lexicon.objects.get_by_slug(lex)
+            except (ValueError, Lexicon.DoesNotExist):
+                return queryset.none()
+            queryset = queryset.filter(lexicon=lexicon)
+        return queryset
 
     @action(detail=False)
+    @cached_response
     def near(self, request):
         self.serializer_class = WordNearSerializer
         query = self.request.query_params.get('q', None)
         lex = self.request.query_params.get('l', '')
         lex = lex.strip()
+        k = self.request.query_params.get('k', None)
+        if k is not None:
+            try:
+                k = max(min(int(k), self.pagination_class.max_limit), 0)
+            except ValueError:
+                return Response(
+                    data={"code": 400, "message": "Bad Request", "details": "k should be an integer."},
+                    status=400,
+                )
+
         queryset = Word.objects.search_near(query, lex)
 
+        # top-k nearest neighbours: skip pagination (and its COUNT query)
+        if k is not None:
+            serializer = self.get_serializer(queryset[:k], many=True)
+            return Response(serializer.data)
+
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -205,22 +462,51 @@ class WordViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
     @action(detail=False)
+    @cached_response
     def search(self, request):
         query = self.request.query_params.get('q', None)
         lex = self.request.query_params.get('l', '')
         if query is not None:
             query = query.strip()
         lex = lex.strip()
-        queryset = Word.objects.search(query, lex)
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+        queryset = self.prefetch(Word.objects.search(query, lex), many=True)
+        return self.list_words(queryset)
+
+    @action(detail=False, url_path='reverse')
+    @cached_response
+    def reverse_search(self, request):
+        """
+        List the words with a translation containing the words of `q`.
+        """
+        query = self.request.query_params.get('q', None)
+        lex = self.request.query_params.get('l', '').strip()
+        queryset = self.prefetch(Word.objects.search_translation(query, lex), many=True)
+        return self.list_words(queryset)
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+    @action(detail=False)
+    @cached_response
+    def corpus(self, request):
+        """
+        List the words of lexicon `l` with examples or etymology containing
+        the words of `q`, sorted by relevance.
+        """
+        query = self.request.query_params.get('q', None)
+        lex = self.request.query_params.get('l', '').strip()
+
+        try:
+            validate_lexicon_slug(lex)
+        except ValueError as e:
+            return Response(
+                data={"code": 400, "message": "Bad Request", "details": str(e)},
+                status=400,
+            )
+
+        queryset = self.prefetch(Word.objects.search_corpus(query, lex), many=True)
+        return self.list_words(queryset)
 
     @action(detail=False)
+    @method_decorator(data_conditions(get_exact_lexicons))
+    @cached_response
     def exact(self, request):
         lex = self.request.query_params.get('l', '')
         term = self.request.query_params.get('q')
@@ -235,20 +521,110 @@ class WordViewSet(viewsets.ReadOnlyModelViewSet):
 
         try:
             lexicon = Lexicon.objects.get_by_slug(lex)
-            instance = lexicon.words.get(term=term)
-        except (Lexicon.DoesNotExist, Word.DoesNotExist):
+        except Lexicon.DoesNotExist:
             raise Http404()
 
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        if documents.is_enabled(request):
+            data = documents.get_document(request, word__lexicon=lexicon, word__term=term)
+            if data is not None:
+                return Response(data)
+
+        words = self.prefetch(lexicon.words)
+        try:
+            instance = words.get(term=term)
+        except Word.DoesNotExist:
+            # accent and case insensitive match (e.g. 'aragon' -> 'Aragón')
+            normalized = normalize_term(term or '')
+            instance = words.filter(normalized_term=normalized).order_by('term').first() if normalized else None
+            if instance is None:
+                raise Http404()
+
+        return Response(self.serialize_words(instance))
+
+    @action(detail=False, methods=['get', 'post'])
+    def batch(self, request):
+        """
+        Retrieve several words using a single request. Words are selected
+        by `terms` (of lexicon `l`), `slugs` or `ids`. Slugs and ids identify
+        words of any lexicon unless `l` is provided.
+        """
+        params = request.data if request.method == 'POST' else request.query_params
+
+        try:
+            if not isinstance(params, dict):
+                raise ValueError("Request body should be an object.")
+
+            field, values = self.get_batch_values(params)
+            queryset = Word.objects.filter(**{field + '__in': values})
+
+            lex = params.get('l', '')
+            if not isinstance(lex, str):
+                raise ValueError("l should be a string.")
+            lex = lex.strip()
+            if lex:
+                validate_lexicon_slug(lex)
+                queryset = queryset.filter(lexicon=Lexicon.objects.get_by_slug(lex))
+            elif field == 'term':
+                raise ValueError("l parameter is required to retrieve words by terms.")
+        except ValueError as e:
+            return Response(
+                data={"code": 400, "message": "Bad Request", "details": str(e)},
+                status=400,
+            )
+        except Lexicon.DoesNotExist:
+            raise Http404()
+
+        words = list(self.prefetch(queryset, many=True))
+        found = {
+            getattr(word, field): data
+            for word, data in zip(words, self.serialize_words(words, many=True))
+        }
 
+        return Response({
+            "results": [found[value] for value in values if value in found],
+            "missing": [value for value in values if value not in found],
+        })
 
-class WordDetailBySlug(generics.RetrieveAPIView):
+    def get_batch_values(self, params):
+        for param, field in self.batch_fields.items():
+            if hasattr(params, 'getlist'):
+                values = params.getlist(param)
+            else:
+                values = params.get(param, [])
+                if not isinstance(values, list):
+                    values = [values]
+            if values:
+                break
+        else:
+            raise ValueError("One of {} parameters is required.".format(', '.join(self.batch_fields)))
+
+        if len(values) > self.batch_max_items:
+            raise ValueError("A maximum of {} words can be retrieved.".format(self.batch_max_items))
+
+        if field == 'pk':
+            try:
+                values = [int(value) for value in values]
+            except (TypeError, ValueError):
+                raise ValueError("ids should be integers.")
+        else:
+            if not all(isinstance(value, str) for value in values):
+                raise ValueError("{} should be strings.".format(param))
+            values = [value.strip() for value in values if value.strip()]
+
+        # remove duplicated values keeping their order
+        return field, list(dict.fromkeys(values))
+
+
+@method_decorator(data_conditions(), name='get')
+class WordDetailBySlug(WordDocumentMixin, generics.RetrieveAPIView):
     queryset = Word.objects.all()
     lookup_field = 'slug'
     serializer_class = WordSerializer
 
 
+@method_decorator(data_conditions(), name='list')
+@method_decorator(data_conditions(), name='retrieve')
+@method_decorator(data_conditions(), name='show')
 class GramaticalCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     """
     API endpoint that allows words to be retrieved.
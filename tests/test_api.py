@@ -1,7 +1,24 @@
+import os
+import shutil
+import tempfile
 import unittest
-
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files import File
+from django.core.management import call_command
 from django.db import connection
-from django.test import TestCase
+from django.db.models import F
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from linguatec_lexicon import documents, tasks, uploads
+from linguatec_lexicon.models import (Lexicon, TaskError, TaskProgress,
+                                      VerbalConjugation, Word, WordDocument)
 
 
 class ApiTestCase(TestCase):
@@ -22,6 +39,43 @@ class ApiTestCase(TestCase):
         resp_json = resp.json()
         self.assertEqual(1, resp_json["count"])
 
+    def test_lexicon_data_version(self):
+        Lexicon.objects.get(pk=1).bump_data_version()
+        resp = self.client.get('/api/lexicons/1/')
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(2, resp.json()["data_version"])
+
+    def test_word_exact_normalized(self):
+        Word.objects.create(lexicon_id=1, term="Aragón")
+        resp = self.client.get('/api/words/exact/?q=aragon&l=es-ar')
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual("Aragón", resp.json()["term"])
+
+    def test_word_exact_not_found(self):
+        resp = self.client.get('/api/words/exact/?q=foo&l=es-ar')
+        self.assertEqual(404, resp.status_code)
+
+    def test_word_reverse_search(self):
+        resp = self.client.get('/api/words/reverse/?q=tiempo&l=es-ar')
+        self.assertEqual(200, resp.status_code)
+
+        resp_json = resp.json()
+        self.assertEqual(1, resp_json["count"])
+        self.assertEqual("edad", resp_json["results"][0]["term"])
+
+    def test_word_corpus_search(self):
+        Word.objects.filter(term="edad").update(etimol="del latín aetas")
+        resp = self.client.get('/api/words/corpus/?q=latín&l=es-ar')
+        self.assertEqual(200, resp.status_code)
+
+        resp_json = resp.json()
+        self.assertEqual(1, resp_json["count"])
+        self.assertEqual("edad", resp_json["results"][0]["term"])
+
+    def test_word_corpus_search_requires_lexicon(self):
+        resp = self.client.get('/api/words/corpus/?q=latín')
+        self.assertEqual(400, resp.status_code)
+
     def test_word_search_no_results(self):
         resp = self.client.get('/api/words/search/?q=foo&l=es-ar')
         self.assertEqual(200, resp.status_code)
@@ -37,6 +91,442 @@ class ApiTestCase(TestCase):
         self.assertEqual(0, resp_json["count"])
 
 
+class WordQueriesTestCase(TestCase):
+    """
+    Serializing words should require a fixed number of queries
+    (independent of the number of words, entries, examples...).
+
+    """
+    fixtures = ['lexicon-sample.json']
+
+    # words + entries + gramcats + labels + examples
+    WORDS_QUERIES = 5
+    # lexicons data versions checked once per request (see LexiconRegistry)
+    REGISTRY_QUERIES = 1
+    # lexicons data versions read for ETag/Last-Modified (see data_conditions)
+    CONDITIONS_QUERIES = 1
+
+    def setUp(self):
+        # lexicons are cached (see LexiconRegistry)
+        Lexicon.objects.get_by_slug('es-ar')
+
+    def test_word_list(self):
+        # count + words details
+        with self.assertNumQueries(1 + self.WORDS_QUERIES):
+            resp = self.client.get('/api/words/')
+        self.assertEqual(200, resp.status_code)
+
+    def test_word_show(self):
+        with self.assertNumQueries(self.WORDS_QUERIES):
+            resp = self.client.get('/api/words/1/')
+        self.assertEqual(200, resp.status_code)
+
+    def test_word_show_by_slug(self):
+        word = Word.objects.get(pk=1)
+        word.save()     # fixtures don't include slug
+        slug = word.slug
+        with self.assertNumQueries(self.REGISTRY_QUERIES + self.CONDITIONS_QUERIES + self.WORDS_QUERIES):
+            resp = self.client.get('/api/words/slug/{}/'.format(slug))
+        self.assertEqual(200, resp.status_code)
+
+    def test_word_search(self):
+        # count + words details
+        with self.assertNumQueries(self.REGISTRY_QUERIES + 1 + self.WORDS_QUERIES):
+            resp = self.client.get('/api/words/search/?q=edad&l=es-ar')
+        self.assertEqual(200, resp.status_code)
+
+    def test_word_exact(self):
+        with self.assertNumQueries(self.REGISTRY_QUERIES + self.CONDITIONS_QUERIES + self.WORDS_QUERIES):
+            resp = self.client.get('/api/words/exact/?q=edad&l=es-ar')
+        self.assertEqual(200, resp.status_code)
+
+    def test_word_batch(self):
+        with self.assertNumQueries(self.REGISTRY_QUERIES + self.WORDS_QUERIES):
+            resp = self.client.get('/api/words/batch/?l=es-ar&terms=edad&terms=echar')
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(2, len(resp.json()["results"]))
+
+
+@override_settings(LINGUATEC_WORD_DOCUMENTS=True)
+class WordDocumentTestCase(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    def setUp(self):
+        word = Word.objects.get(pk=1)
+        word.save()     # fixtures don't include slug
+        self.slug = word.slug
+        call_command('builddocuments', stdout=StringIO())
+
+        # lexicons are cached (see LexiconRegistry)
+        Lexicon.objects.get_by_slug('es-ar')
+
+    def assertSameAsLive(self, url, expected_queries):
+        with self.assertNumQueries(WordQueriesTestCase.REGISTRY_QUERIES + expected_queries):
+            resp = self.client.get(url)
+        self.assertEqual(200, resp.status_code)
+
+        with self.settings(LINGUATEC_WORD_DOCUMENTS=False):
+            live = self.client.get(url)
+        self.assertEqual(live.json(), resp.json())
+
+    def test_build_documents(self):
+        self.assertEqual(Word.objects.count(), WordDocument.objects.count())
+
+    def test_word_show(self):
+        self.assertSameAsLive('/api/words/1/', 1)
+
+    def test_word_show_invalid_pk(self):
+        resp = self.client.get('/api/words/foo/')
+        self.assertEqual(404, resp.status_code)
+
+    def test_word_show_by_slug(self):
+        self.assertSameAsLive('/api/words/slug/{}/'.format(self.slug), WordQueriesTestCase.CONDITIONS_QUERIES + 1)
+
+    def test_word_exact(self):
+        self.assertSameAsLive('/api/words/exact/?q=edad&l=es-ar', WordQueriesTestCase.CONDITIONS_QUERIES + 1)
+
+    def test_word_list(self):
+        # count + words + documents
+        self.assertSameAsLive('/api/words/', 3)
+
+    def test_word_search(self):
+        # count + words + documents
+        self.assertSameAsLive('/api/words/search/?q=edad&l=es-ar', 3)
+
+    def test_outdated_documents(self):
+        Lexicon.objects.get_by_slug('es-ar').bump_data_version()
+        Lexicon.objects.get_by_slug('es-ar')
+        # document + words details
+        self.assertSameAsLive('/api/words/1/', 1 + 5)
+
+    def test_refresh_documents(self):
+        lexicon = Lexicon.objects.get_by_slug('es-ar')
+        versions = {lexicon.pk: lexicon.data_version}
+        lexicon.bump_data_version()
+
+        word = Word.objects.get(pk=1)
+        word.etimol = "lorem ipsum"
+        word.save()
+        documents.refresh_documents(versions, [word.pk])
+
+        self.assertFalse(WordDocument.objects.exclude(data_version=lexicon.data_version).exists())
+        self.assertEqual("lorem ipsum", self.client.get('/api/words/1/').json()["etimol"])
+
+    def test_refresh_documents_on_delete(self):
+        lexicon = Lexicon.objects.get_by_slug('es-ar')
+        model = Word.objects.create(lexicon=lexicon, term='hallar')
+        word = Word.objects.create(lexicon=lexicon, term='trobar')
+        entry = word.entries.create(translation='trobar')
+        VerbalConjugation.objects.create(entry=entry, raw='modelo. conjug. trobar (hallar)')
+        call_command('builddocuments', stdout=StringIO())
+        url = '/api/words/{}/'.format(word.pk)
+        self.assertEqual(model.pk, self.client.get(url).json()["entries"][0]["conjugation"]["model_word_id"])
+
+        # the conjugation of the other word loses its model
+        admin.site._registry[Word].delete_model(RequestFactory().post('/'), model)
+        self.assertIsNone(self.client.get(url).json()["entries"][0]["conjugation"]["model_word_id"])
+
+
+class ValidatorTestCase(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user('editor', password='secret')
+        self.client.force_login(user)
+        self.sample_path = os.path.join(os.path.dirname(__file__), 'fixtures/invalid-gramcat-unknown.xlsx')
+
+        self.upload_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.upload_dir, ignore_errors=True)
+        upload_settings = override_settings(LINGUATEC_UPLOAD_DIR=self.upload_dir)
+        upload_settings.enable()
+        self.addCleanup(upload_settings.disable)
+
+    def validate(self):
+        with open(self.sample_path, 'rb') as f:
+            return self.client.post('/api/validator/', {'input_file': f})
+
+    @mock.patch('linguatec_lexicon.views.async_task')
+    def test_validate_async(self, async_task):
+        resp = self.validate()
+
+        task_id = async_task.call_args.kwargs['task_name']
+        self.assertRedirects(resp, '/api/tasks/{}/'.format(task_id), fetch_redirect_response=False)
+        async_task.assert_called_once_with(tasks.validate_data, 'es-ar', mock.ANY, task_id, task_name=task_id)
+        self.assertEqual(TaskProgress.QUEUED, TaskProgress.objects.get(task_id=task_id).phase)
+
+        # uploaded file is stored on its own directory of the upload dir
+        path = async_task.call_args.args[2]
+        self.assertEqual(self.upload_dir, os.path.dirname(os.path.dirname(path)))
+        with open(path, 'rb') as stored, open(self.sample_path, 'rb') as f:
+            self.assertEqual(f.read(), stored.read())
+
+    @override_settings(LINGUATEC_UPLOAD_MAX_SIZE=1024)
+    @mock.patch('linguatec_lexicon.views.async_task')
+    def test_validate_file_too_large(self, async_task):
+        resp = self.validate()
+
+        self.assertEqual(200, resp.status_code)
+        self.assertIn('input_file', resp.context['form'].errors)
+        async_task.assert_not_called()
+        self.assertEqual([], os.listdir(self.upload_dir))
+
+    def test_validate_data_task(self):
+        with open(self.sample_path, 'rb') as f:
+            tmp_file, _ = uploads.store_upload(File(f))
+
+        count = tasks.validate_data('es-ar', tmp_file, 'task-1')
+
+        self.assertEqual([], os.listdir(self.upload_dir))
+        self.assertEqual(1, count)
+        self.assertEqual('a', TaskError.objects.get(task_id='task-1').word)
+
+        progress = TaskProgress.objects.get(task_id='task-1')
+        self.assertEqual(TaskProgress.DONE, progress.phase)
+        self.assertEqual(1, progress.errors)
+        self.assertEqual(progress.total, progress.rows)
+
+    def test_task_error_writer(self):
+        writer = tasks.TaskErrorWriter('task-1', batch_size=2)
+        writer.add({"word": "a", "column": "B", "message": "foo"})
+        writer.add({"word": "b", "column": "C", "message": ["bar"]})
+        writer.add({"word": "c", "column": "B", "message": "baz"})
+        writer.flush()
+
+        self.assertEqual(
+            [(1, 'a', 'B', 'foo'), (2, 'b', 'C', 'bar'), (3, 'c', 'B', 'baz')],
+            list(TaskError.objects.values_list('position', 'word', 'column', 'message')),
+        )
+
+    def test_task_detail(self):
+        TaskError.objects.bulk_create([
+            TaskError(task_id='task-1', position=i, word=str(i), column='B' if i % 2 else 'C', message='foo')
+            for i in range(1, 121)
+        ])
+        with mock.patch('linguatec_lexicon.views.fetch', return_value=mock.Mock(success=True)):
+            resp = self.client.get('/api/tasks/task-1/?column=B&page=2')
+
+        self.assertTrue(resp.context['task_finished'])
+        self.assertEqual(60, resp.context['task_result'].paginator.count)
+        self.assertEqual(['B', 'C'], [c['column'] for c in resp.context['columns']])
+        self.assertEqual(101, resp.context['task_result'][0].position)
+
+    def test_task_progress_reporter(self):
+        progress = tasks.TaskProgressReporter('task-1', interval=3600)
+        progress.start(TaskProgress.VALIDATING, total=10)
+        progress.update(4, [{"word": "a", "column": "B", "message": "foo"}])
+
+        # saved only every `interval` seconds
+        self.assertEqual(0, TaskProgress.objects.get(task_id='task-1').rows)
+        self.assertFalse(TaskError.objects.exists())
+
+        progress.update(5, [{"word": "a", "column": "B", "message": "foo"},
+                            {"word": "b", "column": "C", "message": "bar"}])
+        progress.save()
+
+        instance = TaskProgress.objects.get(task_id='task-1')
+        self.assertEqual((5, 2, 50), (instance.rows, instance.errors, instance.percent))
+        self.assertEqual(['a', 'b'], list(TaskError.objects.values_list('word', flat=True)))
+
+    @mock.patch('linguatec_lexicon.views.fetch', return_value=None)
+    def test_task_detail_running(self, fetch):
+        TaskProgress.objects.create(task_id='task-1', phase=TaskProgress.VALIDATING, rows=10, total=20, errors=1)
+        TaskError.objects.create(task_id='task-1', position=1, word='a', column='B', message='foo')
+
+        resp = self.client.get('/api/tasks/task-1/')
+
+        self.assertFalse(resp.context['task_finished'])
+        self.assertEqual(50, resp.context['progress'].percent)
+        # partial results
+        self.assertEqual(1, resp.context['task_result'].paginator.count)
+
+    @mock.patch('linguatec_lexicon.views.fetch', return_value=None)
+    def test_task_progress(self, fetch):
+        TaskProgress.objects.create(task_id='task-1', phase=TaskProgress.VALIDATING, rows=10, total=20, errors=1)
+
+        resp = self.client.get('/api/tasks/task-1/progress/')
+        data = resp.json()
+
+        self.assertFalse(data['finished'])
+        self.assertEqual(TaskProgress.VALIDATING, data['phase'])
+        self.assertEqual((10, 20, 50, 1), (data['rows'], data['total'], data['percent'], data['errors']))
+
+        resp = self.client.get('/api/tasks/task-2/progress/')
+        self.assertEqual(404, resp.status_code)
+
+    @override_settings(LINGUATEC_VALIDATION_CACHE='default')
+    @mock.patch('linguatec_lexicon.views.fetch', return_value=mock.Mock(success=True))
+    @mock.patch('linguatec_lexicon.views.async_task')
+    def test_cached_task(self, async_task, fetch):
+        self.validate()
+        task_id = async_task.call_args.kwargs['task_name']
+        resp = self.validate()
+
+        self.assertEqual(1, async_task.call_count)
+        self.assertRedirects(resp, '/api/tasks/{}/'.format(task_id), fetch_redirect_response=False)
+        # the file of the cached validation is removed
+        self.assertEqual(1, len(os.listdir(self.upload_dir)))
+
+    def test_remove_stale_uploads(self):
+        with open(self.sample_path, 'rb') as f:
+            stale, _ = uploads.store_upload(File(f))
+            os.utime(os.path.dirname(stale), (0, 0))
+            path, sha256 = uploads.store_upload(File(f))
+
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(64, len(sha256))
+
+    def test_remove_stale_results(self):
+        for task_id in ['stale', 'recent']:
+            TaskProgress.objects.create(task_id=task_id, phase=TaskProgress.DONE)
+            TaskError.objects.create(task_id=task_id, position=1, message='foo')
+        TaskProgress.objects.filter(task_id='stale').update(updated_at=timezone.now() - timedelta(days=8))
+
+        tasks.remove_stale_results()
+
+        self.assertEqual(['recent'], list(TaskProgress.objects.values_list('task_id', flat=True)))
+        self.assertEqual(['recent'], list(TaskError.objects.values_list('task_id', flat=True)))
+
+    @override_settings(LINGUATEC_VALIDATION_CACHE='default')
+    @mock.patch('linguatec_lexicon.views.fetch', return_value=mock.Mock(success=True))
+    @mock.patch('linguatec_lexicon.views.async_task')
+    def test_cached_task_results_removed(self, async_task, fetch):
+        self.validate()
+        TaskProgress.objects.update(updated_at=timezone.now() - timedelta(days=8))
+        self.validate()
+
+        self.assertEqual(2, async_task.call_count)
+
+    @override_settings(LINGUATEC_VALIDATION_CACHE='default')
+    @mock.patch('linguatec_lexicon.views.fetch', return_value=mock.Mock(success=True))
+    @mock.patch('linguatec_lexicon.views.async_task')
+    def test_cache_invalidated_by_data_version(self, async_task, fetch):
+        self.validate()
+        Lexicon.objects.get_by_slug('es-ar').bump_data_version()
+        self.validate()
+
+        self.assertEqual(2, async_task.call_count)
+
+
+@override_settings(LINGUATEC_RESPONSE_CACHE='default')
+class ResponseCacheTestCase(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    def setUp(self):
+        cache.clear()
+        # lexicons are cached (see LexiconRegistry)
+        Lexicon.objects.get_by_slug('es-ar')
+
+    def test_cached_search(self):
+        resp = self.client.get('/api/words/search/?q=edad&l=es-ar')
+        # lexicons registry + data versions
+        with self.assertNumQueries(2):
+            cached = self.client.get('/api/words/search/?l=es-ar&q=%20edad')
+        self.assertEqual(200, cached.status_code)
+        self.assertEqual(resp.json(), cached.json())
+
+    def test_search_accents_not_shared(self):
+        for term in ['bajar el río', 'río abajo', 'rio']:
+            Word.objects.create(lexicon_id=1, term=term)
+        Lexicon.objects.get_by_slug('es-ar').bump_data_version()
+
+        results = {}
+        for query in ['río', 'rio']:
+            resp = self.client.get('/api/words/search/', {'q': query, 'l': 'es-ar'})
+            results[query] = [word["term"] for word in resp.json()["results"]]
+            expected = Word.objects.search(query, 'es-ar')
+            self.assertEqual(sorted(expected.values_list('term', flat=True)), sorted(results[query]))
+        self.assertNotEqual(sorted(results['río']), sorted(results['rio']))
+
+    def test_exact_not_normalized(self):
+        Word.objects.create(lexicon_id=1, term="té")
+        Word.objects.create(lexicon_id=1, term="te")
+        Lexicon.objects.get_by_slug('es-ar').bump_data_version()
+        self.assertEqual("té", self.client.get('/api/words/exact/?q=té&l=es-ar').json()["term"])
+        self.assertEqual("te", self.client.get('/api/words/exact/?q=te&l=es-ar').json()["term"])
+
+    def test_invalidated_by_other_process(self):
+        resp = self.client.get('/api/words/exact/?q=aragon&l=es-ar')
+        self.assertEqual(404, resp.status_code)
+
+        # changed without notifying this process
+        Word.objects.create(lexicon_id=1, term="Aragón")
+        Lexicon.objects.filter(pk=1).update(data_version=F('data_version') + 1)
+        resp = self.client.get('/api/words/exact/?q=aragon&l=es-ar')
+        self.assertEqual(200, resp.status_code)
+
+    def test_cached_not_found(self):
+        resp = self.client.get('/api/words/exact/?q=foo&l=es-ar')
+        self.assertEqual(404, resp.status_code)
+        # lexicons registry + data versions
+        with self.assertNumQueries(2):
+            resp = self.client.get('/api/words/exact/?q=foo&l=es-ar')
+        self.assertEqual(404, resp.status_code)
+
+    def test_invalidated_by_data_version(self):
+        resp = self.client.get('/api/words/exact/?q=aragon&l=es-ar')
+        self.assertEqual(404, resp.status_code)
+
+        Word.objects.create(lexicon_id=1, term="Aragón")
+        Lexicon.objects.get_by_slug('es-ar').bump_data_version()
+        resp = self.client.get('/api/words/exact/?q=aragon&l=es-ar')
+        self.assertEqual(200, resp.status_code)
+
+
+class ConditionalGetTestCase(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    def setUp(self):
+        # lexicons are cached (see LexiconRegistry)
+        Lexicon.objects.get_by_slug('es-ar')
+
+    def test_not_modified(self):
+        for url in ['/api/words/exact/?q=edad&l=es-ar', '/api/lexicons/', '/api/gramcats/']:
+            resp = self.client.get(url)
+            self.assertEqual(200, resp.status_code)
+            self.assertTrue(resp.has_header('ETag'))
+            self.assertTrue(resp.has_header('Last-Modified'))
+
+            # only lexicons registry + data versions
+            with self.assertNumQueries(2):
+                resp = self.client.get(url, HTTP_IF_NONE_MATCH=resp['ETag'])
+            self.assertEqual(304, resp.status_code)
+
+    def test_not_modified_by_slug(self):
+        word = Word.objects.get(pk=1)
+        word.save()     # fixtures don't include slug
+        url = '/api/words/slug/{}/'.format(word.slug)
+        resp = self.client.get(url)
+        self.assertEqual(200, resp.status_code)
+
+        resp = self.client.get(url, HTTP_IF_MODIFIED_SINCE=resp['Last-Modified'])
+        self.assertEqual(304, resp.status_code)
+
+    def test_modified_after_data_version_bump(self):
+        url = '/api/words/exact/?q=edad&l=es-ar'
+        etag = self.client.get(url)['ETag']
+
+        Lexicon.objects.get_by_slug('es-ar').bump_data_version()
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, resp.status_code)
+        self.assertNotEqual(etag, resp['ETag'])
+
+    def test_etag_depends_on_query(self):
+        etag = self.client.get('/api/words/exact/?q=edad&l=es-ar')['ETag']
+        resp = self.client.get('/api/words/exact/?q=echar&l=es-ar', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, resp.status_code)
+
+    def test_modified_by_other_process(self):
+        url = '/api/lexicons/'
+        last_modified = self.client.get(url)['Last-Modified']
+
+        # changed without notifying this process
+        Lexicon.objects.filter(pk=1).update(data_updated=timezone.now() + timedelta(days=1))
+        resp = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(200, resp.status_code)
+
+
 class LexiconAPITestCase(TestCase):
     fixtures = ['lexicon-sample.json']
 
@@ -91,6 +581,21 @@ class VerbsAPITestCase(TestCase):
                 self.assertIn('model_word_id', entry['conjugation'])
                 self.assertEqual(entry['conjugation']['model_word_id'], 4434)
 
+    def test_word_verb_parsed_conjugation(self):
+        call_command('parseconjugations', stdout=StringIO())
+        conjugation = VerbalConjugation.objects.get(entry__translation__contains='capuzar')
+        self.assertNotEqual('', conjugation.parsed)
+        self.assertEqual(4434, conjugation.model_word_ref_id)
+
+        # stored conjugations don't require extra queries
+        with self.assertNumQueries(WordQueriesTestCase.WORDS_QUERIES):
+            response = self.client.get('/api/words/8546/').json()
+
+        for entry in response['entries']:
+            if 'capuzar' in entry['translation']:
+                self.assertEqual('trobar', entry['conjugation']['model'])
+                self.assertEqual(entry['conjugation']['model_word_id'], 4434)
+
 
 class SearchTestCase(TestCase):
     fixtures = ['lexicons.json',
@@ -154,6 +659,107 @@ class SearchTestCase(TestCase):
         self.do_and_check_query(query, expected_results)
 
 
+class BatchTestCase(TestCase):
+    fixtures = ['lexicons.json',
+                'gramcatical-categories.json', 'words-search.json']
+
+    def setUp(self):
+        # lexicons are cached (see LexiconRegistry)
+        Lexicon.objects.get_by_slug('es-ar')
+
+    def test_batch_terms(self):
+        resp = self.client.get('/api/words/batch/?l=es-ar&terms=espino&terms=foo&terms=garza')
+        self.assertEqual(200, resp.status_code)
+
+        resp_json = resp.json()
+        self.assertEqual(["espino", "garza"], [word["term"] for word in resp_json["results"]])
+        self.assertEqual(["foo"], resp_json["missing"])
+
+    def test_batch_ids_post(self):
+        ids = list(Word.objects.order_by('-pk').values_list('pk', flat=True)[:2])
+        resp = self.client.post('/api/words/batch/', {'ids': ids + [0]}, content_type='application/json')
+        self.assertEqual(200, resp.status_code)
+
+        resp_json = resp.json()
+        self.assertEqual(ids, [word["id"] for word in resp_json["results"]])
+        self.assertEqual([0], resp_json["missing"])
+
+    def test_batch_terms_require_lexicon(self):
+        resp = self.client.get('/api/words/batch/?terms=espino')
+        self.assertEqual(400, resp.status_code)
+
+    def test_batch_invalid_ids(self):
+        resp = self.client.get('/api/words/batch/?ids=foo')
+        self.assertEqual(400, resp.status_code)
+
+    def test_batch_too_many_items(self):
+        resp = self.client.post('/api/words/batch/', {'l': 'es-ar', 'terms': ['foo'] * 100 + ['bar']},
+                                content_type='application/json')
+        self.assertEqual(400, resp.status_code)
+
+    def test_batch_invalid_body(self):
+        for body in [['espino'], 'espino', {'l': 1, 'terms': ['espino']}, {'l': ['es-ar'], 'terms': ['espino']},
+                     {'l': 'es-ar', 'terms': [{'term': 'espino'}]}]:
+            resp = self.client.post('/api/words/batch/', body, content_type='application/json')
+            self.assertEqual(400, resp.status_code, body)
+
+    def test_batch_slugs_of_several_lexicons(self):
+        lexicon = Lexicon.objects.create(name='ar-es', src_language='ar', dst_language='es')
+        words = [Word.objects.get(lexicon__src_language='es', term='espino'),
+                 Word.objects.create(lexicon=lexicon, term='espino')]
+        for word in words:
+            word.save()     # fixtures don't include slug
+        slugs = [word.slug for word in words]
+
+        # without lexicon words of any lexicon are retrieved
+        resp = self.client.get('/api/words/batch/?slugs={}&slugs={}'.format(*slugs))
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual([word.pk for word in words], [word["id"] for word in resp.json()["results"]])
+
+        resp = self.client.get('/api/words/batch/?l=ar-es&slugs={}&slugs={}'.format(*slugs))
+        self.assertEqual([words[1].pk], [word["id"] for word in resp.json()["results"]])
+        self.assertEqual([slugs[0]], resp.json()["missing"])
+
+
+class CursorPaginationTestCase(TestCase):
+    fixtures = ['lexicons.json',
+                'gramcatical-categories.json', 'words-search.json']
+
+    def walk(self, url):
+        terms = []
+        while url is not None:
+            resp = self.client.get(url)
+            self.assertEqual(200, resp.status_code)
+            resp_json = resp.json()
+            self.assertNotIn("count", resp_json)
+            terms += [word["term"] for word in resp_json["results"]]
+            url = resp_json["next"]
+        return terms
+
+    def test_word_list(self):
+        terms = self.walk('/api/words/?pagination=cursor&limit=2')
+        expected = list(Word.objects.order_by('term', 'id').values_list('term', flat=True))
+        self.assertEqual(expected, terms)
+
+    def test_word_list_by_lexicon(self):
+        terms = self.walk('/api/words/?pagination=cursor&limit=2&l=es-ar')
+        expected = list(Word.objects.filter(lexicon__src_language='es', lexicon__dst_language='ar').order_by(
+            'term').values_list('term', flat=True))
+        self.assertEqual(expected, terms)
+
+    def test_word_list_by_lexicon_not_found(self):
+        resp = self.client.get('/api/words/?l=en-zh')
+        self.assertEqual(0, resp.json()["count"])
+
+    def test_word_search_ignores_cursor(self):
+        # results keep sorted by relevance using limit/offset pagination
+        resp = self.client.get('/api/words/search/?q=espino&l=es-ar&pagination=cursor&limit=1')
+        self.assertEqual(200, resp.status_code)
+        resp_json = resp.json()
+        self.assertEqual(2, resp_json["count"])
+        self.assertEqual(["espino"], [word["term"] for word in resp_json["results"]])
+
+
 @unittest.skipUnless(connection.vendor == 'postgresql', "requires PostgreSQL backend")
 class NearWordTestCase(TestCase):
     fixtures = ['lexicons.json',
@@ -182,3 +788,15 @@ class NearWordTestCase(TestCase):
 
         resp_json = resp.json()
         self.assertEqual(0, resp_json["count"])
+
+    def test_top_k(self):
+        resp = self.client.get('/api/words/near/?q=echar&l=es-ar&k=3')
+        self.assertEqual(200, resp.status_code)
+
+        near_words = [x["term"] for x in resp.json()]
+        self.assertEqual(3, len(near_words))
+        self.assertEqual("echar", near_words[0])
+
+    def test_top_k_invalid(self):
+        resp = self.client.get('/api/words/near/?q=echar&l=es-ar&k=foo')
+        self.assertEqual(400, resp.status_code)
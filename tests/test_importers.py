@@ -1,13 +1,17 @@
 import os
+import unittest
 from io import StringIO
 
 from django.core.management import call_command
 from django.core.management.base import CommandError
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
 
+from linguatec_lexicon import loaders
+from linguatec_lexicon.management.commands import importdata
 from linguatec_lexicon.models import (DiatopicVariation, Entry, Example,
-                                      GramaticalCategory, Lexicon, Region,
-                                      VerbalConjugation, Word)
+                                      GramaticalCategory, ImportRecord, Label,
+                                      Lexicon, Region, VerbalConjugation, Word)
 
 
 BASE_PATH = os.path.dirname(os.path.abspath(__file__))
@@ -61,6 +65,71 @@ class ImporterTestCase(TestCase):
         # call_command('dumpdata', 'linguatec_lexicon', indent=4, output='/tmp/test-output.json')
         # and fixtures/sample-output.json
 
+    def test_import_batch_size(self):
+        NUMBER_OF_ENTRIES = 16
+
+        sample_path = os.path.join(BASE_PATH, 'fixtures/sample-input.xlsx')
+        out = StringIO()
+        call_command('importdata', self.LEXICON_CODE, sample_path, batch_size=3, stdout=out)
+
+        self.assertEqual(NUMBER_OF_ENTRIES, Entry.objects.count())
+        self.assertFalse(Entry.objects.filter(gramcats__isnull=True).exists())
+        self.assertIn(Entry.gramcats.through._meta.db_table, out.getvalue())
+        self.assertIn(Example._meta.db_table, out.getvalue())
+
+    def test_update(self):
+        sample_path = os.path.join(BASE_PATH, 'fixtures/sample-input.xlsx')
+        call_command('importdata', self.LEXICON_CODE, sample_path)
+        word = Word.objects.get(term='edad')
+
+        update_path = os.path.join(BASE_PATH, 'fixtures/sample-input-update.xlsx')
+        out = StringIO()
+        call_command('importdata', self.LEXICON_CODE, update_path, update=True, stdout=out)
+
+        self.assertIn("words: +1 -0 | entries: +1 ~2 -1", out.getvalue())
+        self.assertEqual(13, Word.objects.count())
+        # words & entries are updated instead of recreated
+        self.assertEqual(word.slug, Word.objects.get(pk=word.pk).slug)
+        self.assertEqual(
+            ['Ye de muita edá', '¿Qué tiempo tiene ixa ninona?'],
+            list(Example.objects.filter(entry__word=word).order_by('entry').values_list('phrase', flat=True)),
+        )
+        self.assertEqual(3, Word.objects.get(term='echar').entries.count())
+
+    def test_update_prune(self):
+        sample_path = os.path.join(BASE_PATH, 'fixtures/sample-input.xlsx')
+        call_command('importdata', self.LEXICON_CODE, sample_path)
+
+        update_path = os.path.join(BASE_PATH, 'fixtures/sample-input-update.xlsx')
+        call_command('importdata', self.LEXICON_CODE, update_path, update=True, prune=True)
+
+        self.assertFalse(Word.objects.filter(term='idiota').exists())
+        self.assertEqual(12, Word.objects.count())
+
+    def test_update_dry_run(self):
+        sample_path = os.path.join(BASE_PATH, 'fixtures/sample-input.xlsx')
+        call_command('importdata', self.LEXICON_CODE, sample_path)
+
+        update_path = os.path.join(BASE_PATH, 'fixtures/sample-input-update.xlsx')
+        out = StringIO()
+        call_command('importdata', self.LEXICON_CODE, update_path, update=True, dry_run=True, stdout=out)
+
+        self.assertIn("words: +1 -0 | entries: +1 ~2 -1", out.getvalue())
+        self.assertFalse(Word.objects.filter(term='iglú').exists())
+
+    def test_read_input_file(self):
+        sample_path = os.path.join(BASE_PATH, 'fixtures/abcd.xlsx')
+        command = importdata.Command()
+        command.input_file = sample_path
+
+        rows = [row for row in command.read_input_file() if row[1]]
+
+        self.assertEqual(4, len(rows))
+        self.assertEqual(
+            (1, 'a', 'prep.', '(índice funcional) a, (direccional) ta', '', '', ''),
+            rows[0],
+        )
+
     def test_missing_letters_as_sheets(self):
         NUMBER_OF_WORDS = 4
 
@@ -135,6 +204,7 @@ class ImporterTestCase(TestCase):
                                                             dst_language=self.LEXICON_CODE[3:]))
         entry = word.entries.get(translation__contains="adubir")
         self.assertIsNotNone(entry.conjugation)
+        self.assertNotEqual('', entry.conjugation.parsed)
 
     def test_word_with_partial_verbal_conjugation(self):
         NUMBER_OF_WORDS = 3
@@ -232,6 +302,31 @@ class ImporterTestCase(TestCase):
         self.assertEqual(3, Entry.objects.count())
 
 
+class LoaderTestCase(TestCase):
+    def setUp(self):
+        self.lexicon = Lexicon.objects.create(name='es-ar', src_language='es', dst_language='ar')
+
+    def test_to_copy_text(self):
+        self.assertEqual('\\N', loaders.to_copy_text(None))
+        self.assertEqual('t', loaders.to_copy_text(True))
+        self.assertEqual('a\\tb\\nc\\\\d', loaders.to_copy_text('a\tb\nc\\d'))
+
+    @unittest.skipIf(connection.vendor == 'postgresql', "requires a backend without COPY")
+    def test_copy_fallback(self):
+        loader = loaders.get_loader('copy', batch_size=10)
+        self.assertEqual('bulk', loader.name)
+
+    def test_create(self):
+        loader = loaders.get_loader('copy', batch_size=10)
+        labels = loader.create(Label, [
+            Label(name='zool.', lexicon=self.lexicon),
+            Label(name='bot.\tfam.', lexicon=self.lexicon),
+        ])
+
+        self.assertEqual(2, Label.objects.count())
+        self.assertEqual('bot.\tfam.', Label.objects.get(pk=labels[1].pk).name)
+
+
 class ImportGramCatTestCase(TestCase):
     NUMBER_OF_GRAMCATS = 79
 
@@ -372,3 +467,61 @@ class ImportVariationTestCase(TestCase):
         call_command('importvariation', 'es-ar', sample_path,
                      variation='benas', dry_run=True, verbosity=3, stdout=out)
         self.assertNotIn('error', out.getvalue())
+
+
+class ImportManifestTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Lexicon.objects.create(name='es-ar', src_language='es', dst_language='ar')
+        ribagorza = Region.objects.create(name="Ribagorza")
+        DiatopicVariation.objects.create(name="benasqués", abbreviation="Benas.", region=ribagorza)
+
+        sample_path = os.path.join(APP_BASE_PATH, 'fixtures/gramcat-es-ar.csv')
+        call_command('importgramcat', sample_path, verbosity=0)
+
+        cls.manifest_path = os.path.join(BASE_PATH, 'fixtures/manifest.json')
+
+    def test_import(self):
+        call_command('importmanifest', self.manifest_path, jobs=1, stdout=StringIO())
+
+        self.assertTrue(Word.objects.filter(term='abanico').exists())
+        self.assertEqual(115, Entry.objects.filter(variation__name='benasqués').values('word').distinct().count())
+        self.assertEqual(2, ImportRecord.objects.count())
+
+    def test_skip_unchanged(self):
+        call_command('importmanifest', self.manifest_path, jobs=1, stdout=StringIO())
+        entries = Entry.objects.count()
+
+        out = StringIO()
+        call_command('importmanifest', self.manifest_path, jobs=1, stdout=out)
+
+        self.assertEqual(2, out.getvalue().count('[skip]'))
+        self.assertEqual(entries, Entry.objects.count())
+
+    def test_invalid_manifest(self):
+        self.assertRaises(CommandError, call_command, 'importmanifest',
+                          os.path.join(BASE_PATH, 'fixtures/sample-input.xlsx'))
+
+
+class ImportManifestParallelTestCase(TransactionTestCase):
+    # workers are forked after closing the connections, so the test data
+    # can't live in a transaction
+    available_apps = ['linguatec_lexicon', 'tests']
+
+    def setUp(self):
+        Lexicon.objects.create(name='es-ar', src_language='es', dst_language='ar')
+        Lexicon.objects.create(name='ar-es', src_language='ar', dst_language='es')
+        ribagorza = Region.objects.create(name="Ribagorza")
+        DiatopicVariation.objects.create(name="benasqués", abbreviation="Benas.", region=ribagorza)
+
+        sample_path = os.path.join(APP_BASE_PATH, 'fixtures/gramcat-es-ar.csv')
+        call_command('importgramcat', sample_path, verbosity=0)
+
+    def test_import(self):
+        manifest_path = os.path.join(BASE_PATH, 'fixtures/manifest-parallel.json')
+        call_command('importmanifest', manifest_path, jobs=2, stdout=StringIO())
+
+        self.assertTrue(Word.objects.filter(lexicon__name='es-ar', term='abanico').exists())
+        self.assertEqual(12, Word.objects.filter(lexicon__name='ar-es').count())
+        self.assertEqual(115, Entry.objects.filter(variation__name='benasqués').values('word').distinct().count())
+        self.assertEqual(3, ImportRecord.objects.count())
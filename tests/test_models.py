@@ -1,11 +1,13 @@
 import os
 import unittest
 
+from django.core.exceptions import ValidationError
 from django.core.management import call_command
-from django.db import IntegrityError, connection
-from django.test import TestCase
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase
 
-from linguatec_lexicon.models import (DiatopicVariation, Entry,
+from linguatec_lexicon.models import (DiatopicVariation, Entry, Example,
                                       GramaticalCategory, Lexicon, Region,
                                       VerbalConjugation, Word,
                                       annotate_words_slug)
@@ -163,6 +165,81 @@ class VerbalConjugationModelTestCase(TestCase):
         self.assertEqual(v.raw, parsed_conjugation["intro"])
 
 
+class LexiconRegistryTestCase(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    def test_get_by_slug_cached(self):
+        lexicon = Lexicon.objects.get_by_slug('es-ar')
+        # only the versions of the lexicons are checked
+        with self.assertNumQueries(1):
+            self.assertIs(lexicon, Lexicon.objects.get_by_slug('es-ar'))
+
+    def test_get_by_slug_topic(self):
+        lexicon = Lexicon.objects.create(name='flora', src_language='es', dst_language='ar', topic='Flora')
+        self.assertEqual(lexicon, Lexicon.objects.get_by_slug('es-ar@flora'))
+        self.assertEqual(lexicon, Lexicon.objects.get_by_slug('es-ar@Flora'))
+
+    def test_get_by_slug_invalidated_on_save(self):
+        with self.assertRaises(Lexicon.DoesNotExist):
+            Lexicon.objects.get_by_slug('ar-es')
+
+        lexicon = Lexicon.objects.create(name='ar-es', src_language='ar', dst_language='es')
+        self.assertEqual(lexicon, Lexicon.objects.get_by_slug('ar-es'))
+
+    def test_get_by_slug_invalidated_on_delete(self):
+        Lexicon.objects.get_by_slug('es-ar').delete()
+        with self.assertRaises(Lexicon.DoesNotExist):
+            Lexicon.objects.get_by_slug('es-ar')
+
+    def test_get_by_slug_invalidated_on_update(self):
+        lexicon = Lexicon.objects.get_by_slug('es-ar')
+        lexicon.topic = 'Flora'
+        lexicon.save()
+        self.assertEqual(2, lexicon.data_version)
+        self.assertEqual(lexicon, Lexicon.objects.get_by_slug('es-ar@flora'))
+        with self.assertRaises(Lexicon.DoesNotExist):
+            Lexicon.objects.get_by_slug('es-ar')
+
+    def test_get_by_slug_changed_by_other_process(self):
+        Lexicon.objects.get_by_slug('es-ar')
+        # changes done without notifying this process
+        Lexicon.objects.filter(src_language='es').update(topic='Flora', data_version=F('data_version') + 1)
+        self.assertEqual('Flora', Lexicon.objects.get_by_slug('es-ar@flora').topic)
+
+    def test_get_by_slug_rollback(self):
+        Lexicon.objects.get_by_slug('es-ar')
+        with transaction.atomic():
+            Lexicon.objects.get_by_slug('es-ar').delete()
+            lexicon = Lexicon.objects.create(name='ar-es', src_language='ar', dst_language='es')
+            self.assertEqual(lexicon, Lexicon.objects.get_by_slug('ar-es'))
+            transaction.set_rollback(True)
+
+        self.assertEqual('es-ar', Lexicon.objects.get_by_slug('es-ar').code)
+        with self.assertRaises(Lexicon.DoesNotExist):
+            Lexicon.objects.get_by_slug('ar-es')
+
+    def test_get_by_slug_invalid_code(self):
+        with self.assertRaises(ValueError):
+            Lexicon.objects.get_by_slug('foo')
+
+
+class LexiconDataVersionTestCase(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    def test_bump_data_version(self):
+        lexicon = Lexicon.objects.get_by_slug('es-ar')
+        self.assertEqual(1, lexicon.data_version)
+
+        lexicon.bump_data_version()
+        self.assertEqual(2, lexicon.data_version)
+        self.assertEqual(2, Lexicon.objects.get_by_slug('es-ar').data_version)
+
+    def test_bump_data_version_on_import(self):
+        sample_path = os.path.join(APP_BASE_PATH, 'fixtures/gramcat-es-ar.csv')
+        call_command('importgramcat', sample_path, purge=True, verbosity=0)
+        self.assertEqual(2, Lexicon.objects.get_by_slug('es-ar').data_version)
+
+
 class WordManagerTestCase(TestCase):
     fixtures = ['lexicon-sample.json']
 
@@ -188,10 +265,151 @@ class WordManagerTestCase(TestCase):
         result = Word.objects.search("hacer", "es-ar")
         self.assertEqual(result[0].term, "hacer")
 
+    def test_search_normalized(self):
+        lexicon = Lexicon.objects.get(src_language="es", dst_language="ar")
+        Word.objects.create(lexicon=lexicon, term="río")
+        Word.objects.create(lexicon=lexicon, term="Río Ebro")
+
+        result = Word.objects.search("¿RIO?", "es-ar")
+        self.assertEqual(["Río Ebro", "río"], sorted(result.values_list('term', flat=True)))
+
+    def test_normalized_term_on_save(self):
+        word = Word.objects.get(pk=1)
+        word.term = "Acción"
+        word.save(update_fields=['term'])
+        word.refresh_from_db()
+        self.assertEqual("accion", word.normalized_term)
+
+    def test_search_translation(self):
+        result = Word.objects.search_translation("chitar", "es-ar")
+        self.assertEqual(["echar"], list(result.values_list('term', flat=True)))
+
+    def test_search_translation_several_words(self):
+        result = Word.objects.search_translation("fer clis", "es-ar")
+        self.assertEqual(["eclipsar"], list(result.values_list('term', flat=True)))
+
+    def test_search_translation_whole_words(self):
+        result = Word.objects.search_translation("chita", "es-ar")
+        self.assertEqual(0, result.count())
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', "requires PostgreSQL backend")
+    def test_search_translation_vector_updated(self):
+        entry = Entry.objects.get(pk=8)
+        entry.translation = "tiempo, añada"
+        entry.save()
+        result = Word.objects.search_translation("añada", "es-ar")
+        self.assertEqual(["edad"], list(result.values_list('term', flat=True)))
+
+    def test_search_corpus(self):
+        Word.objects.filter(term="edad").update(etimol="del latín aetas")
+        Example.objects.create(entry_id=3, phrase="Os paxaros arrullan en o árbol.")
+
+        result = Word.objects.search_corpus("latín", "es-ar")
+        self.assertEqual(["edad"], list(result.values_list('term', flat=True)))
+
+        result = Word.objects.search_corpus("árbol", "es-ar")
+        self.assertEqual(["echar"], list(result.values_list('term', flat=True)))
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', "requires PostgreSQL backend")
+    def test_search_corpus_config(self):
+        word = Word.objects.get(term="edad")
+        word.etimol = "derivado de los latines"
+        word.save()
+        self.assertEqual(0, Word.objects.search_corpus("latín", "es-ar").count())
+
+        # changing the configuration of the lexicon reindexes its words
+        lexicon = Lexicon.objects.get_by_slug("es-ar")
+        lexicon.search_config = 'spanish'
+        lexicon.save()
+        self.assertEqual(1, Word.objects.search_corpus("latines", "es-ar").count())
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', "requires PostgreSQL backend")
+    def test_search_config_validation(self):
+        lexicon = Lexicon.objects.get(src_language='es', dst_language='ar')
+        lexicon.search_config = 'spanish'
+        lexicon.full_clean()
+
+        lexicon.search_config = 'klingon'
+        with self.assertRaises(ValidationError) as cm:
+            lexicon.full_clean()
+        self.assertIn('search_config', cm.exception.message_dict)
+
+    def test_with_gramcats(self):
+        expected = {word.pk: word.gramcats() for word in Word.objects.all()}
+
+        # words + entries + gramcats (or a single aggregated query)
+        with self.assertNumQueries(1 if connection.vendor == 'postgresql' else 3):
+            gramcats = {word.pk: word.gramcats() for word in Word.objects.with_gramcats()}
+        self.assertEqual(expected, gramcats)
+
+    def test_with_gramcats_without_entries(self):
+        word = Word.objects.create(lexicon=Lexicon.objects.get(src_language='es'), term="foo")
+        self.assertEqual(set(), word.gramcats())
+        self.assertEqual(set(), Word.objects.with_gramcats().get(pk=word.pk).gramcats())
+
+        # entries without gramatical categories
+        Entry.objects.create(word=word, translation="bar")
+        self.assertEqual(set(), word.gramcats())
+        self.assertEqual(set(), Word.objects.with_gramcats().get(pk=word.pk).gramcats())
+
+    def test_search_near_lazy(self):
+        # similarity threshold is set when the query is run (not when it's built)
+        with self.assertNumQueries(0):
+            Word.objects.search_near("edad")
+
     def test_search_query_unbalanced_parenthesis(self):
         result = Word.objects.search("largo(a", "es-ar")
         self.assertEqual(0, result.count())
 
+    @unittest.skipUnless(connection.vendor == 'postgresql', "requires PostgreSQL backend")
+    def test_search_trigram_index(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Word._meta.db_table)
+        self.assertIn('linguatec_lexicon_word_lexicon_term_trgm', constraints)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "requires PostgreSQL backend")
+class SimilarityThresholdTestCase(TransactionTestCase):
+    # autocommit mode (TestCase runs every test inside a transaction)
+    available_apps = ['linguatec_lexicon', 'tests']
+    fixtures = ['lexicon-sample.json']
+
+    def test_threshold_not_leaked(self):
+        result = Word.objects.search_near("edad", "es-ar")
+        self.assertEqual(["edad"], [word.term for word in result[:1]])
+
+        # threshold doesn't leak to other queries of the connection
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT current_setting('pg_trgm.similarity_threshold')")
+            self.assertEqual('0.3', cursor.fetchone()[0])
+
+
+class VerbalConjugationModelWordTestCase(TestCase):
+    fixtures = ['lexicon-sample.json']
+
+    def test_refresh_model_word_refs(self):
+        entry = Entry.objects.filter(conjugation__isnull=True).select_related('word__lexicon').first()
+        lexicon = entry.word.lexicon
+        conjugation = VerbalConjugation.objects.create(entry=entry, raw='modelo. conjug. trobar (hallar)')
+        self.assertIsNone(conjugation.model_word_ref_id)
+
+        # model verb imported after the conjugation
+        model = Word.objects.create(lexicon=lexicon, term='hallar')
+        qs = VerbalConjugation.objects.filter(entry__word__lexicon=lexicon)
+        self.assertEqual(1, qs.refresh_model_word_refs({'hallar': model.pk}))
+        conjugation.refresh_from_db()
+        self.assertEqual(model.pk, conjugation.model_word_ref_id)
+
+        # model verb deleted and imported again
+        model.delete()
+        model = Word.objects.create(lexicon=lexicon, term='hallar')
+        self.assertEqual(1, qs.refresh_model_word_refs({'hallar': model.pk}))
+        conjugation.refresh_from_db()
+        self.assertEqual(model.pk, conjugation.model_word_ref_id)
+
+        # already resolved
+        self.assertEqual(0, qs.refresh_model_word_refs({'hallar': model.pk}))
+
 
 class WordSlugTest(TestCase):
     fixtures = ['lexicon-sample.json']
@@ -18,3 +18,11 @@ class UtilsTest(TestCase):
 
     def test_invalid_missing_dest_language_code(self):
         self.assertRaises(ValueError, utils.get_lexicon_languages_from_code, "foo-")
+
+    def test_normalize_term(self):
+        self.assertEqual("aragon", utils.normalize_term("¡ARAGÓN!"))
+        self.assertEqual("hacer camino", utils.normalize_term(" Hacer  camino "))
+
+    def test_normalize_term_keep_letters(self):
+        self.assertEqual("año", utils.normalize_term("Año"))
+        self.assertEqual("canço", utils.normalize_term("cançó"))